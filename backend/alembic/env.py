@@ -0,0 +1,59 @@
+# backend/alembic/env.py
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import SQLALCHEMY_DATABASE_URL, create_db_engine
+from app.models import Base
+
+config = context.config
+
+# The app configures its own logging when it runs migrations at startup
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or SQLALCHEMY_DATABASE_URL
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of running it"""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_with(connection)
+        return
+
+    engine = create_db_engine(database_url())
+    try:
+        with engine.connect() as connection:
+            run_with(connection)
+    finally:
+        engine.dispose()
+
+
+def run_with(connection):
+    # Batch mode lets ALTERs work on SQLite by copying the table
+    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
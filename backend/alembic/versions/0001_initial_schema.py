@@ -0,0 +1,99 @@
+"""Initial schema, as created by Base.metadata.create_all before migrations
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-09-28 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "channels",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("stream_url", sa.String(length=500), nullable=True),
+        sa.Column("is_live", sa.Boolean(), nullable=True),
+        sa.Column("current_listeners", sa.Integer(), nullable=True),
+        sa.Column("genre", sa.String(length=50), nullable=True),
+        sa.Column("image_url", sa.String(length=500), nullable=True),
+        sa.Column("color", sa.String(length=7), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "push_subscriptions",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("endpoint", sa.Text(), nullable=False),
+        sa.Column("keys", sa.JSON(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "advertisements",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("image_url", sa.String(length=500), nullable=True),
+        sa.Column("target_url", sa.String(length=500), nullable=True),
+        sa.Column("duration", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "tracks",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("artist", sa.String(length=100), nullable=False),
+        sa.Column("album", sa.String(length=100), nullable=True),
+        sa.Column("duration", sa.Integer(), nullable=True),
+        sa.Column("file_path", sa.String(length=500), nullable=True),
+        sa.Column("channel_id", sa.String(), nullable=True),
+        sa.Column("play_count", sa.Integer(), nullable=True),
+        sa.Column("affiliate_links", sa.JSON(), nullable=True),
+        sa.Column("cover_art", sa.String(length=500), nullable=True),
+        sa.ForeignKeyConstraint(["channel_id"], ["channels.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "user_interactions",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("channel_id", sa.String(), nullable=True),
+        sa.Column("interaction_type", sa.String(length=50), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=True),
+        sa.ForeignKeyConstraint(["channel_id"], ["channels.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "programs",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("host", sa.String(length=100), nullable=True),
+        sa.Column("channel_id", sa.String(), nullable=True),
+        sa.Column("schedule", sa.String(length=100), nullable=True),
+        sa.Column("image_url", sa.String(length=500), nullable=True),
+        sa.Column("next_airtime", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["channel_id"], ["channels.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("programs")
+    op.drop_table("user_interactions")
+    op.drop_table("tracks")
+    op.drop_table("advertisements")
+    op.drop_table("push_subscriptions")
+    op.drop_table("channels")
@@ -0,0 +1,26 @@
+"""Composite indexes for track lists, interaction history and upcoming programs
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_tracks_channel_id_id", "tracks", ["channel_id", "id"])
+    op.create_index("ix_user_interactions_channel_id_timestamp", "user_interactions", ["channel_id", "timestamp"])
+    op.create_index("ix_programs_channel_id_next_airtime", "programs", ["channel_id", "next_airtime"])
+    op.create_index("ix_programs_next_airtime", "programs", ["next_airtime"])
+
+
+def downgrade():
+    op.drop_index("ix_programs_next_airtime", table_name="programs")
+    op.drop_index("ix_programs_channel_id_next_airtime", table_name="programs")
+    op.drop_index("ix_user_interactions_channel_id_timestamp", table_name="user_interactions")
+    op.drop_index("ix_tracks_channel_id_id", table_name="tracks")
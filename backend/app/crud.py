@@ -0,0 +1,118 @@
+# backend/app/crud.py
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Select, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Channel, Program, Track, UserInteraction
+
+CHANNEL_SEED_FIELDS = (
+    "id", "name", "description", "genre", "image_url", "color",
+    "current_listeners", "is_live", "stream_url", "created_at",
+)
+TRACK_SEED_FIELDS = ("id", "title", "artist", "album", "duration", "cover_art")
+PROGRAM_SEED_FIELDS = ("id", "title", "description", "host", "channel_id", "schedule", "image_url", "next_airtime")
+
+
+async def list_channels(db: AsyncSession) -> List[Channel]:
+    result = await db.execute(select(Channel).order_by(Channel.created_at, Channel.id))
+    return list(result.scalars())
+
+
+# Query builders are kept separate so scripts/check_query_plans.py can EXPLAIN them
+
+def tracks_query(channel_id: Optional[str] = None) -> Select:
+    query = select(Track).order_by(Track.channel_id, Track.id)
+    if channel_id:
+        query = query.where(Track.channel_id == channel_id)
+    return query
+
+
+def programs_query(channel_id: Optional[str] = None, after: Optional[datetime] = None) -> Select:
+    query = select(Program)
+    if channel_id:
+        query = query.where(Program.channel_id == channel_id)
+    if after is not None:
+        query = query.where(Program.next_airtime > after).order_by(Program.next_airtime)
+    else:
+        query = query.order_by(Program.id)
+    return query
+
+
+def aired_programs_query(now: datetime) -> Select:
+    """Recurring programs whose next airtime has passed"""
+    return select(Program).where(Program.next_airtime <= now, Program.schedule.is_not(None))
+
+
+def interactions_query(channel_id: str, limit: int = 50) -> Select:
+    return (
+        select(UserInteraction)
+        .where(UserInteraction.channel_id == channel_id)
+        .order_by(UserInteraction.timestamp.desc())
+        .limit(limit)
+    )
+
+
+async def list_tracks(db: AsyncSession, channel_id: Optional[str] = None) -> List[Track]:
+    result = await db.execute(tracks_query(channel_id))
+    return list(result.scalars())
+
+
+async def list_programs(db: AsyncSession, channel_id: Optional[str] = None,
+                        after: Optional[datetime] = None) -> List[Program]:
+    """Programs, optionally for one channel and only those airing after a given time"""
+    result = await db.execute(programs_query(channel_id, after))
+    return list(result.scalars())
+
+
+async def list_interactions(db: AsyncSession, channel_id: str, limit: int = 50) -> List[UserInteraction]:
+    """Most recent interactions on a channel"""
+    result = await db.execute(interactions_query(channel_id, limit))
+    return list(result.scalars())
+
+
+async def insert_interactions(db: AsyncSession, rows: List[Dict]):
+    """Bulk insert in one statement and one commit"""
+    if rows:
+        await db.execute(insert(UserInteraction), rows)
+        await db.commit()
+
+
+def _seed_values(row: Dict, fields: Iterable[str]) -> Dict:
+    values = {field: row[field] for field in fields if field in row}
+    for field in ("created_at", "next_airtime"):
+        if isinstance(values.get(field), str):
+            values[field] = datetime.fromisoformat(values[field])
+    return values
+
+
+def _insert_ignoring_conflicts(db: AsyncSession, model):
+    """INSERT that skips rows whose primary key already exists"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    return insert(model)
+
+
+async def _seed_table(db: AsyncSession, model, rows: List[Dict]):
+    if rows and (await db.execute(select(model.id).limit(1))).first() is None:
+        await db.execute(_insert_ignoring_conflicts(db, model), rows)
+
+
+async def seed_database(db: AsyncSession, channels: Iterable[Dict], tracks: Dict[str, List[Dict]],
+                        programs: Iterable[Dict]):
+    """Populate empty tables, e.g. on a fresh development database
+
+    Every worker seeds at startup, so rows another worker inserted first are skipped.
+    """
+    await _seed_table(db, Channel, [_seed_values(row, CHANNEL_SEED_FIELDS) for row in channels])
+    await _seed_table(db, Track, [
+        {**_seed_values(row, TRACK_SEED_FIELDS), "channel_id": channel_id}
+        for channel_id, rows in tracks.items() for row in rows
+    ])
+    await _seed_table(db, Program, [_seed_values(row, PROGRAM_SEED_FIELDS) for row in programs])
+    await db.commit()
@@ -1,14 +1,105 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool, StaticPool
+from typing import Dict, Type
 import os
 
-# Use SQLite for development
-SQLALCHEMY_DATABASE_URL = "sqlite:///./radio_app.db"
+# Use SQLite for development; set DATABASE_URL (e.g. postgresql://...) for anything else
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./radio_app.db")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# SQLite tuning, applied to every new connection
+# WAL lets readers proceed while a write is in progress
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+# NORMAL is durable across app crashes in WAL mode and skips an fsync per commit
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+# Page cache per connection; negative values are KiB
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Seconds a writer waits for the lock before failing with "database is locked"
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "5"))
+
+SQLITE_PRAGMAS = {
+    "journal_mode": SQLITE_JOURNAL_MODE,
+    "synchronous": SQLITE_SYNCHRONOUS,
+    "cache_size": SQLITE_CACHE_SIZE,
+    "mmap_size": SQLITE_MMAP_SIZE,
+    "busy_timeout": int(SQLITE_BUSY_TIMEOUT * 1000),
+}
+# Per-file settings that mean nothing for an in-memory database
+FILE_ONLY_PRAGMAS = ("journal_mode", "mmap_size")
+
+# Connection pool for server databases
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle connections before server-side idle timeouts close them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# Async drivers for each sync dialect, so one URL configures both engines
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """Translate a sync database URL to its async driver, e.g. sqlite:// -> sqlite+aiosqlite://"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if parsed.drivername in ASYNC_DRIVERS.values() or backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def is_memory_database(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+def engine_options(url: str, queue_pool: Type[Pool] = QueuePool) -> Dict:
+    """Pool and driver settings for a database URL"""
+    if make_url(url).get_backend_name() != "sqlite":
+        return {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }
+    connect_args = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT}
+    if is_memory_database(url):
+        # Every connection would otherwise get its own empty database
+        return {"connect_args": connect_args, "poolclass": StaticPool}
+    # SQLite serializes writers anyway; a small pool keeps warm page caches without piling up on the lock
+    return {"connect_args": connect_args, "poolclass": queue_pool,
+            "pool_size": 5, "max_overflow": 10, "pool_timeout": DB_POOL_TIMEOUT}
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict = SQLITE_PRAGMAS):
+    """Tune every new SQLite connection for concurrent readers and one writer"""
+    if is_memory_database(str(engine.url)):
+        pragmas = {name: value for name, value in pragmas.items() if name not in FILE_ONLY_PRAGMAS}
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, pragmas: Dict = SQLITE_PRAGMAS) -> Engine:
+    engine = create_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+def create_async_db_engine(url: str = SQLALCHEMY_DATABASE_URL, pragmas: Dict = SQLITE_PRAGMAS) -> AsyncEngine:
+    async_url = async_database_url(url)
+    engine = create_async_engine(async_url, **engine_options(async_url, AsyncAdaptedQueuePool))
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(engine.sync_engine, pragmas)
+    return engine
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -17,4 +108,13 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Request handlers run on the event loop and must use the async engine
+async_engine = create_async_db_engine()
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
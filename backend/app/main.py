@@ -1,23 +1,42 @@
 from fastapi import FastAPI, WebSocket, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import json
-import asyncio
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import math
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Union
 import uuid
 
 # Import from the single models file
-from .models import Base, Channel, Program, Track, UserInteraction, Advertisement, PushSubscription
-from .database import engine, get_db
+from .models import Channel, Program, Track, UserInteraction, Advertisement, PushSubscription
+from . import crud
+from .database import AsyncSessionLocal, async_engine, get_db
+from pydantic import TypeAdapter
+
 from .schemas import (
     ChannelResponse, ProgramResponse, TrackResponse, 
-    UserMessage, NowPlayingResponse, AffiliateLinkResponse,
+    UserMessage, NowPlayingResponse, ChannelNowPlaying, ServerTimeResponse, AffiliateLinkResponse,
     PushSubscriptionCreate, NotificationRequest
 )
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from .services.backplane import backplane
+from .services.channel_catalog import CatalogSnapshot, channel_catalog
+from .services.connection import Connection
+from .services.event_log import event_logs
+from .services.fanout import fanout_engine
+from .services.frames import Frame, encode_frame
+from .services.heartbeat import heartbeat_wheel
+from .services.interactions import interaction_row, interaction_writer
+from .services.http_cache import OverlayTemplate, etag_store, resource_versions, response_cache
+from .services.likes import like_aggregator
+from .services.listener_counts import cluster_listener_counter, listener_count_publisher
+from .services.metrics import loop_lag_monitor
+from .services.playout import playout_scheduler
+from .services.program_schedule import next_airtime, program_schedule
+from .services.rate_limit import rate_limiter
+from .services.records import TrackRecord
+from .services.registry import GLOBAL_TOPIC, connection_registry
+from .services.sse import SSEConnection
 
 app = FastAPI(
     title="WaveRadio API",
@@ -34,13 +53,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Serializers for conditional (ETag) responses
+CHANNEL_LIST = TypeAdapter(List[ChannelResponse])
+TRACK_LIST = TypeAdapter(List[TrackResponse])
+PROGRAM_LIST = TypeAdapter(List[ProgramResponse])
+NOW_PLAYING_LIST = TypeAdapter(List[ChannelNowPlaying])
+
 # Global state for real-time features
-active_connections: Dict[str, List[WebSocket]] = {}
 now_playing_data: Dict[str, Dict] = {}
 user_sessions: Dict[str, Dict] = {}
 push_subscriptions: List[Dict] = []
 
-# Enhanced mock data
+# Seed data for an empty development database
 MOCK_CHANNELS = [
     {
         "id": "1",
@@ -52,6 +76,7 @@ MOCK_CHANNELS = [
         "current_listeners": 1242,
         "is_live": True,
         "stream_url": "https://stream.example.com/lofi",
+        "created_at": "2025-09-27T00:00:00",
         "schedule": {
             "monday": ["06:00-10:00 Morning Chill", "14:00-18:00 Afternoon Vibes"],
             "friday": ["20:00-23:00 Weekend Warmup"]
@@ -67,6 +92,7 @@ MOCK_CHANNELS = [
         "current_listeners": 876,
         "is_live": True,
         "stream_url": "https://stream.example.com/focus",
+        "created_at": "2025-09-27T00:00:00",
         "schedule": {
             "tuesday": ["08:00-12:00 Work Flow", "15:00-19:00 Deep Sessions"]
         }
@@ -80,7 +106,8 @@ MOCK_CHANNELS = [
         "color": "#059669",
         "current_listeners": 543,
         "is_live": False,
-        "stream_url": "https://stream.example.com/jazz"
+        "stream_url": "https://stream.example.com/jazz",
+        "created_at": "2025-09-27T00:00:00"
     }
 ]
 
@@ -97,51 +124,169 @@ MOCK_TRACKS = {
     ]
 }
 
+MOCK_PROGRAMS = [
+    {
+        "id": "p1",
+        "title": "Morning Chill",
+        "description": "Start your day with relaxing lo-fi beats",
+        "host": "DJ Chill",
+        "channel_id": "1",
+        "schedule": "Mon-Fri 06:00-10:00",
+        "image_url": "https://images.unsplash.com/photo-1511379938547-c1f69419868d?w=400&h=200&fit=crop"
+    },
+    {
+        "id": "p2", 
+        "title": "Deep Work Sessions",
+        "description": "Focus-enhancing electronic music",
+        "host": "Focus Master",
+        "channel_id": "2",
+        "schedule": "Tue-Thu 08:00-12:00",
+        "image_url": "https://images.unsplash.com/photo-1571330735066-03aaa9429d89?w=400&h=200&fit=crop"
+    }
+]
+# Seeded at the next start of each weekly slot; the schedule moves them on after every airing
+for program in MOCK_PROGRAMS:
+    program["next_airtime"] = next_airtime(program["schedule"], datetime.now())
+
 @app.get("/")
 async def root():
     return {"message": "WaveRadio API", "status": "online", "version": "2.1.0"}
 
 @app.get("/api/channels", response_model=List[ChannelResponse])
-async def get_channels(genre: Optional[str] = None, featured: bool = False):
-    channels = MOCK_CHANNELS.copy()
-    
-    if genre:
-        channels = [c for c in channels if c["genre"].lower() == genre.lower()]
+async def get_channels(request: Request, genre: Optional[str] = None, featured: bool = False,
+                       is_live: Optional[bool] = None):
+    # Normalized once so the cache key and the lookup can't disagree
+    genre = genre.lower() if genre else None
+    # Unknown genres would each leave a cached empty list behind
+    if genre and not channel_catalog.has_genre(genre):
+        raise HTTPException(status_code=404, detail="Genre not found")
     
-    for channel in channels:
-        channel_id = channel["id"]
-        channel["current_listeners"] = len(active_connections.get(channel_id, []))
+    def build() -> OverlayTemplate:
+        # Listener counts change far more often than the catalog: leave holes for them
+        channels = [channel.to_dict(current_listeners=-(index + 1))
+                    for index, channel in enumerate(channel_catalog.list(genre, is_live))]
+        
+        body = CHANNEL_LIST.dump_json(CHANNEL_LIST.validate_python(channels))
+        return OverlayTemplate(body, "current_listeners", [c["id"] for c in channels])
     
-    return channels
+    key = ("channels", genre, featured, is_live)
+    template = response_cache.get_or_build(key, ("channels",), build)
+    # Listener counts are part of the body, so their version is part of the ETag's
+    version = (resource_versions.get("channels"), cluster_listener_counter.version)
+    return etag_store.respond(request, key, version, lambda: template.render(cluster_listener_counter.count))
 
 @app.get("/api/channels/{channel_id}", response_model=ChannelResponse)
 async def get_channel(channel_id: str):
-    channel = next((c for c in MOCK_CHANNELS if c["id"] == channel_id), None)
+    channel = channel_catalog.get(channel_id)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
     
-    channel["current_listeners"] = len(active_connections.get(channel_id, []))
-    return channel
+    return channel.to_dict(current_listeners=cluster_listener_counter.count(channel_id))
 
 @app.get("/api/channels/{channel_id}/now-playing", response_model=NowPlayingResponse)
 async def get_now_playing(channel_id: str):
-    channel = next((c for c in MOCK_CHANNELS if c["id"] == channel_id), None)
+    channel = channel_catalog.get(channel_id)
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
     
-    current_track = now_playing_data.get(channel_id, {}).get("track")
-    if not current_track and channel_id in MOCK_TRACKS:
-        current_track = MOCK_TRACKS[channel_id][0] if MOCK_TRACKS[channel_id] else None
+    current_track = playing_track(channel_id, channel_catalog.snapshot)
+    duration = (current_track.duration or 0) if current_track else 0
+    started_at = now_playing_data.get(channel_id, {}).get("started_at")
+    now = time.time()
     
+    listeners = cluster_listener_counter.count(channel_id)
     return {
-        "track": current_track,
-        "channel": channel,
-        "listeners": len(active_connections.get(channel_id, [])),
-        "progress": now_playing_data.get(channel_id, {}).get("progress", 0),
-        "duration": current_track.get("duration", 0) if current_track else 0,
+        "track": current_track.to_dict() if current_track else None,
+        "channel": channel.to_dict(current_listeners=listeners),
+        "listeners": listeners,
+        "progress": playback_progress(started_at, duration, now),
+        "duration": duration,
+        "started_at": started_at,
+        "server_time": now,
         "is_ad": False
     }
 
+@app.get("/api/now-playing", response_model=List[ChannelNowPlaying])
+async def get_all_now_playing(request: Request, channel_ids: Optional[str] = None):
+    """Now playing and listener counts for every channel, or a comma-separated subset"""
+    snapshot = channel_catalog.snapshot
+    if channel_ids:
+        requested = set(channel_ids.split(","))
+        channels = [c for c in snapshot.channels if c.id in requested]
+    else:
+        channels = snapshot.channels
+    
+    def build() -> OverlayTemplate:
+        entries = []
+        for index, channel in enumerate(channels):
+            track = playing_track(channel.id, snapshot)
+            entries.append({
+                "channel_id": channel.id,
+                "track": track.to_dict() if track else None,
+                "listeners": -(index + 1),
+                "duration": (track.duration or 0) if track else 0,
+                "started_at": now_playing_data.get(channel.id, {}).get("started_at"),
+                "is_ad": False
+            })
+        body = NOW_PLAYING_LIST.dump_json(NOW_PLAYING_LIST.validate_python(entries))
+        return OverlayTemplate(body, "listeners", [c.id for c in channels])
+    
+    # Rebuilt once per playout tick, whatever the number of readers
+    key = ("now_playing", tuple(c.id for c in channels) if channel_ids else None)
+    template = response_cache.get_or_build(key, ("now_playing", "channels"), build)
+    version = (resource_versions.get("now_playing"), resource_versions.get("channels"),
+               cluster_listener_counter.version)
+    response = etag_store.respond(request, key, version, lambda: template.render(cluster_listener_counter.count))
+    # Progress is derived by the client from started_at and this clock reference
+    response.headers["X-Server-Time"] = f"{time.time():.3f}"
+    return response
+
+@app.get("/api/time", response_model=ServerTimeResponse)
+async def get_server_time(client_time: Optional[float] = None):
+    """Clock reference so clients can derive playback progress from started_at"""
+    # Echoing the client's send time lets it correct for the round trip
+    return JSONResponse({"server_time": time.time(), "client_time": client_time},
+                        headers={"Cache-Control": "no-store"})
+
+def playback_progress(started_at: Optional[float], duration: int, now: float) -> int:
+    if started_at is None:
+        return 0
+    return max(0, min(duration, int(now - started_at)))
+
+def playing_track(channel_id: str, snapshot: CatalogSnapshot) -> Optional[TrackRecord]:
+    track = now_playing_data.get(channel_id, {}).get("track")
+    if not track:
+        tracks = snapshot.tracks.get(channel_id, ())
+        track = tracks[0] if tracks else None
+    return track
+
+@app.get("/api/channels/{channel_id}/events")
+async def get_channel_events(channel_id: str, request: Request):
+    """Server-Sent Events stream of now_playing and listener_count updates"""
+    if channel_catalog.get(channel_id) is None:
+        raise HTTPException(status_code=404, detail="Channel not found")
+    
+    # Browsers send Last-Event-ID when they reconnect on their own
+    last_seq = parse_seq(request.headers.get("last-event-id") or request.query_params.get("last_event_id"))
+    
+    async def events():
+        # Register only once the body is iterated, so a client gone before then leaves nothing behind
+        connection = SSEConnection()
+        connection_registry.add(connection)
+        try:
+            subscribe_topic(connection, channel_id, last_seq)
+            async for chunk in connection.stream():
+                yield chunk
+        finally:
+            for topic in connection_registry.discard(connection):
+                mark_listener_change(topic)
+            await connection.stop()
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
 @app.post("/api/push-subscribe")
 async def subscribe_to_push(subscription: PushSubscriptionCreate):
     """Store push notification subscription"""
@@ -164,18 +309,37 @@ async def send_notification(notification: NotificationRequest):
     return {"status": "sent", "recipients": len(push_subscriptions)}
 
 @app.post("/api/messages")
-async def send_message(message: UserMessage, background_tasks: BackgroundTasks):
+async def send_message(message: UserMessage, request: Request, background_tasks: BackgroundTasks):
     """Send user message/dedication"""
+    # Checked before buffering: a row for an unknown channel would fail its whole batch
+    if channel_catalog.get(message.channel_id) is None:
+        raise HTTPException(status_code=404, detail="Channel not found")
+    
+    client_host = request.client.host if request.client else None
+    retry_after = rate_limiter.check(None, client_host, message.user_id, "user_message",
+                                     cluster_listener_counter.count(message.channel_id))
+    if retry_after:
+        raise HTTPException(status_code=429, detail="Too many messages",
+                            headers={"Retry-After": str(math.ceil(retry_after))})
+    
     message_id = str(uuid.uuid4())
+    timestamp = datetime.now()
+    
+    # Store message; written in the next bulk insert rather than per request
+    stored = await interaction_writer.put(interaction_row(
+        message.user_id, message.channel_id, message.type, message.content, timestamp, message_id
+    ))
+    if not stored:
+        raise HTTPException(status_code=503, detail="Too busy to store messages",
+                            headers={"Retry-After": "1"})
     
-    # Store message
     message_data = {
         "id": message_id,
         "user_id": message.user_id,
         "channel_id": message.channel_id,
         "type": message.type,
         "content": message.content,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": timestamp.isoformat(),
         "status": "sent"
     }
     
@@ -185,57 +349,46 @@ async def send_message(message: UserMessage, background_tasks: BackgroundTasks):
     return {"status": "sent", "message_id": message_id, "timestamp": message_data["timestamp"]}
 
 @app.get("/api/channels/{channel_id}/tracks", response_model=List[TrackResponse])
-async def get_channel_tracks(channel_id: str):
-    if channel_id not in MOCK_TRACKS:
-        return []
-    
-    tracks = MOCK_TRACKS[channel_id].copy()
-    # Add affiliate links to each track
-    for track in tracks:
-        track["affiliate_links"] = {
-            "spotify": f"https://open.spotify.com/track/{track['id']}",
-            "apple_music": f"https://music.apple.com/track/{track['id']}",
-            "amazon": f"https://amazon.com/music/track/{track['id']}"
-        }
-        track["play_count"] = 0  # Mock play count
+async def get_channel_tracks(channel_id: str, request: Request):
+    if channel_catalog.get(channel_id) is None:
+        raise HTTPException(status_code=404, detail="Channel not found")
+    
+    def build() -> bytes:
+        # Add affiliate links to each track
+        tracks = [track.to_dict(affiliate_links=affiliate_links(track.id))
+                  for track in channel_catalog.tracks(channel_id)]
+        return TRACK_LIST.dump_json(TRACK_LIST.validate_python(tracks))
     
-    return tracks
+    key = ("tracks", channel_id)
+    return etag_store.respond(request, key, resource_versions.get("tracks"),
+                              lambda: response_cache.get_or_build(key, ("tracks",), build))
+
+def affiliate_links(track_id: str) -> Dict[str, str]:
+    return {
+        "spotify": f"https://open.spotify.com/track/{track_id}",
+        "apple_music": f"https://music.apple.com/track/{track_id}",
+        "amazon": f"https://amazon.com/music/track/{track_id}"
+    }
 
 @app.get("/api/programs", response_model=List[ProgramResponse])
-async def get_programs(channel_id: Optional[str] = None, upcoming: bool = True):
-    # Mock program data
-    programs = [
-        {
-            "id": "p1",
-            "title": "Morning Chill",
-            "description": "Start your day with relaxing lo-fi beats",
-            "host": "DJ Chill",
-            "channel_id": "1",
-            "schedule": "Mon-Fri 06:00-10:00",
-            "image_url": "https://images.unsplash.com/photo-1511379938547-c1f69419868d?w=400&h=200&fit=crop",
-            "next_airtime": (datetime.now().replace(hour=6, minute=0, second=0) + timedelta(days=1)).isoformat()
-        },
-        {
-            "id": "p2", 
-            "title": "Deep Work Sessions",
-            "description": "Focus-enhancing electronic music",
-            "host": "Focus Master",
-            "channel_id": "2",
-            "schedule": "Tue-Thu 08:00-12:00",
-            "image_url": "https://images.unsplash.com/photo-1571330735066-03aaa9429d89?w=400&h=200&fit=crop",
-            "next_airtime": (datetime.now().replace(hour=8, minute=0, second=0) + timedelta(days=1)).isoformat()
-        }
-    ]
+async def get_programs(request: Request, channel_id: Optional[str] = None, upcoming: bool = True):
+    if channel_id and channel_catalog.get(channel_id) is None:
+        raise HTTPException(status_code=404, detail="Channel not found")
     
-    if channel_id:
-        programs = [p for p in programs if p["channel_id"] == channel_id]
+    now = datetime.now()
     
-    if upcoming:
-        # Filter for upcoming programs
-        programs = [p for p in programs if datetime.fromisoformat(p["next_airtime"]) > datetime.now()]
-        programs.sort(key=lambda x: x["next_airtime"])
+    async def build() -> bytes:
+        async with AsyncSessionLocal() as db:
+            await program_schedule.advance(db, now)
+            programs = await crud.list_programs(db, channel_id, now if upcoming else None)
+        program_schedule.watch(programs, now)
+        return PROGRAM_LIST.dump_json(PROGRAM_LIST.validate_python(programs, from_attributes=True))
     
-    return programs
+    # Listings only change when a program goes on air
+    program_schedule.expire_if_due(now)
+    key = ("programs", channel_id, upcoming)
+    return await etag_store.respond_async(request, key, resource_versions.get("programs"),
+                                          lambda: response_cache.get_or_build_async(key, ("programs",), build))
 
 @app.get("/api/tracks/{track_id}/affiliate-links", response_model=AffiliateLinkResponse)
 async def get_affiliate_links(track_id: str):
@@ -251,127 +404,300 @@ async def get_affiliate_links(track_id: str):
         "commission_rate": "5%"
     }
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Real-time delivery metrics"""
+    return {
+        "connections": connection_registry.total,
+        "broadcast": fanout_engine.stats.snapshot(),
+        "listener_counts": listener_count_publisher.stats(),
+        "backplane": backplane.stats(),
+        "event_log": event_logs.stats(),
+        "heartbeat": heartbeat_wheel.stats(),
+        "rate_limit": rate_limiter.stats(),
+        "likes": like_aggregator.stats(),
+        "interactions": interaction_writer.stats(),
+        "playout": playout_scheduler.stats(),
+        "loop_lag_ms": loop_lag_monitor.snapshot(),
+        "http_cache": etag_store.stats(),
+        "response_cache": response_cache.stats()
+    }
+
+def parse_seq(value) -> Optional[int]:
+    """Client-supplied last_seq, ignored unless it is a non-negative integer"""
+    if isinstance(value, int) and value >= 0:
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+@app.websocket("/ws")
+async def multiplexed_websocket_endpoint(websocket: WebSocket):
+    """One connection following any number of topics via subscribe messages"""
+    await serve_websocket(websocket, None)
+
 @app.websocket("/ws/{channel_id}")
 async def websocket_endpoint(websocket: WebSocket, channel_id: str):
+    await serve_websocket(websocket, channel_id)
+
+async def serve_websocket(websocket: WebSocket, channel_id: Optional[str]):
     await websocket.accept()
+    connection = Connection(websocket)
+    connection.start()
     
     # Add to active connections
-    if channel_id not in active_connections:
-        active_connections[channel_id] = []
-    active_connections[channel_id].append(websocket)
+    connection_registry.add(connection)
+    heartbeat_wheel.track(connection)
     
-    # Send initial data
-    await send_initial_data(websocket, channel_id)
+    # Path-based connections start subscribed to their channel, replaying
+    # missed events for reconnecting clients
+    if channel_id and not subscribe_topic(connection, channel_id, parse_seq(websocket.query_params.get("last_seq"))):
+        connection.send(encode_frame({"type": "subscribe_failed", "channel_id": channel_id}))
     
     try:
         while True:
             data = await websocket.receive_text()
+            connection.touch()
             message = json.loads(data)
-            await handle_websocket_message(websocket, channel_id, message)
+            await handle_websocket_message(connection, channel_id, message)
                 
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
         # Clean up on disconnect
-        if channel_id in active_connections and websocket in active_connections[channel_id]:
-            active_connections[channel_id].remove(websocket)
-        await broadcast_listener_count(channel_id)
-
-async def send_initial_data(websocket: WebSocket, channel_id: str):
-    """Send initial data when client connects"""
-    # Send listener count
-    await websocket.send_text(json.dumps({
-        "type": "listener_count",
-        "count": len(active_connections.get(channel_id, [])),
-        "channel_id": channel_id
-    }))
-    
-    # Send now playing info
-    current_track = now_playing_data.get(channel_id, {}).get("track")
-    if current_track:
-        await websocket.send_text(json.dumps({
-            "type": "now_playing",
-            "track": current_track,
-            "channel_id": channel_id,
-            "progress": now_playing_data[channel_id].get("progress", 0)
+        heartbeat_wheel.untrack(connection)
+        for topic in connection_registry.discard(connection):
+            mark_listener_change(topic)
+        await connection.stop()
+
+def reap_connection(connection: Connection):
+    """Drop a connection that stopped answering heartbeats"""
+    for topic in connection_registry.discard(connection):
+        mark_listener_change(topic)
+    connection.close(code=1001)
+
+def mark_listener_change(topic: str):
+    if topic != GLOBAL_TOPIC:
+        listener_count_publisher.mark(topic)
+
+def subscribe_topic(connection: Connection, topic: str, last_seq: Optional[int] = None) -> bool:
+    """Follow a topic and queue its initial data"""
+    # Only the summary topic and known channels can be followed, and so posted to
+    if not isinstance(topic, str) or (topic != GLOBAL_TOPIC and channel_catalog.get(topic) is None):
+        return False
+    if not connection_registry.subscribe(connection, topic):
+        return False
+    mark_listener_change(topic)
+    send_initial_data(connection, topic, last_seq)
+    return True
+
+def send_initial_data(connection: Connection, channel_id: str, last_seq: Optional[int] = None):
+    """Queue initial data when client subscribes"""
+    if channel_id == GLOBAL_TOPIC:
+        # Summary topic: current listener count of every channel
+        for summary_channel_id, count in cluster_listener_counter.counts().items():
+            connection.send(encode_frame({
+                "type": "listener_count",
+                "count": count,
+                "channel_id": summary_channel_id
+            }))
+    else:
+        # Send listener count
+        connection.send(encode_frame({
+            "type": "listener_count",
+            "count": cluster_listener_counter.count(channel_id),
+            "channel_id": channel_id
         }))
+        
+        # Send now playing info, reusing the frame encoded when the track started
+        frame = now_playing_data.get(channel_id, {}).get("frame")
+        if frame:
+            connection.send(frame)
+    
+    if last_seq is not None:
+        # Replay only what was missed; a gap the log can't cover needs a full refresh
+        missed = event_logs.since(channel_id, last_seq, connection.max_queue // 2, connection.accepts)
+        if missed is None:
+            connection.send(encode_frame({
+                "type": "resync",
+                "channel_id": channel_id,
+                "seq": event_logs.head(channel_id)
+            }))
+        else:
+            for frame in missed:
+                connection.send(frame)
 
-async def handle_websocket_message(websocket: WebSocket, channel_id: str, message: dict):
+async def handle_websocket_message(connection: Connection, channel_id: Optional[str], message: dict):
     """Handle incoming WebSocket messages"""
     message_type = message.get("type")
+    # Multiplexed clients name the channel; path-based ones default to their own
+    target = message.get("channel_id") or channel_id
+    if not isinstance(target, str):
+        # Lists and other JSON values can't name a topic
+        target = None
+    
+    if message_type == "subscribe":
+        subscribed = bool(target) and subscribe_topic(connection, target, parse_seq(message.get("last_seq")))
+        connection.send(encode_frame({
+            "type": "subscribed" if subscribed else "subscribe_failed",
+            "channel_id": target
+        }))
+    
+    elif message_type == "unsubscribe":
+        if target and connection_registry.unsubscribe(connection, target):
+            mark_listener_change(target)
+        connection.send(encode_frame({"type": "unsubscribed", "channel_id": target}))
+    
+    elif message_type == "ping":
+        connection.send(PONG_FRAME)
+    
+    elif message_type == "pong":
+        # Heartbeat reply; receiving it already refreshed the connection
+        return
+    
+    elif target not in connection.topics:
+        # Only subscribed channels can be posted to
+        return
     
-    if message_type == "user_message":
+    elif rate_limiter.limits(message_type) and reject_if_rate_limited(connection, target, message_type, message):
+        # Rejected before broadcast, so the channel never sees the amplified traffic
+        return
+    
+    elif message_type == "user_message":
         # Handle user messages/dedications
-        await broadcast_message(channel_id, {
+        user_id = message.get("user_id", "anonymous")
+        timestamp = datetime.now()
+        row = interaction_row(user_id, target, "message", message.get("content"), timestamp)
+        if not await store_interaction(connection, target, message_type, row):
+            return
+        await broadcast_message(target, {
             "type": "user_message",
-            "user_id": message.get("user_id", "anonymous"),
+            "user_id": user_id,
             "content": message.get("content"),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp.isoformat()
         })
     
     elif message_type == "track_like":
-        # Handle track likes
-        await broadcast_message(channel_id, {
-            "type": "track_like",
-            "track_id": message.get("track_id"),
-            "user_id": message.get("user_id"),
-            "timestamp": datetime.now().isoformat()
-        })
-    
-    elif message_type == "ping":
-        await websocket.send_text(json.dumps({"type": "pong"}))
-
-async def broadcast_message(channel_id: str, message: dict):
-    """Broadcast message to all connected clients in a channel"""
-    if channel_id in active_connections:
-        disconnected = []
-        for websocket in active_connections[channel_id]:
-            try:
-                await websocket.send_text(json.dumps(message))
-            except:
-                disconnected.append(websocket)
+        # Handle track likes; listeners get periodic track_like_summary frames
+        track_id = message.get("track_id")
+        user_id = message.get("user_id")
+        if not track_id or not await like_aggregator.claim(target, str(track_id), user_id):
+            return
+        # Counted only once stored, so a rejected like never reaches the summary
+        if await store_interaction(connection, target, message_type, interaction_row(user_id, target, "like", str(track_id))):
+            like_aggregator.add(target, str(track_id))
+        else:
+            await like_aggregator.release(target, str(track_id), user_id)
+
+PONG_FRAME = encode_frame({"type": "pong"})
+
+def reject_if_rate_limited(connection: Connection, channel_id: str, message_type: str, message: dict) -> bool:
+    """Charge the sender's token buckets and tell the client when it is over budget"""
+    retry_after = rate_limiter.check(connection, connection.client_host, message.get("user_id"),
+                                     message_type, cluster_listener_counter.count(channel_id))
+    if not retry_after:
+        return False
+    connection.send(encode_frame({
+        "type": "rate_limited",
+        "message_type": message_type,
+        "channel_id": channel_id,
+        "retry_after": round(retry_after, 3)
+    }))
+    return True
+
+async def store_interaction(connection: Connection, channel_id: str, message_type: str, row: Dict) -> bool:
+    """Queue a row for the bulk insert, telling the client when the buffer stayed full"""
+    # A full buffer holds up this socket's reads rather than growing memory
+    if await interaction_writer.put(row):
+        return True
+    connection.send(encode_frame({
+        "type": "server_busy",
+        "message_type": message_type,
+        "channel_id": channel_id,
+        "retry_after": 1
+    }))
+    return False
+
+async def broadcast_message(channel_id: str, message: Union[dict, Frame]):
+    """Broadcast message to all connected clients in a channel, on every worker"""
+    if isinstance(message, Frame):
+        await backplane.publish(channel_id, message)
+    else:
+        # Sequence events so reconnecting clients can resume where they left off.
+        # The seq is assigned as part of the publish, so every worker sees them in order;
+        # the frame is serialized once and reused across channels and workers.
+        await backplane.publish_sequenced(channel_id, message)
+
+def deliver_local(channel_id: str, frame: Frame):
+    """Deliver a frame to the clients connected to this worker"""
+    if frame.seq is not None:
+        event_logs.record(channel_id, frame)
+    recipients = connection_registry.snapshot(channel_id)
+    if recipients:
+        # Only queues frames; each connection's writer task does the socket I/O
+        dropped = fanout_engine.fan_out(recipients, frame)
         
-        # Clean up disconnected clients
-        for ws in disconnected:
-            active_connections[channel_id].remove(ws)
-
-async def broadcast_listener_count(channel_id: str):
-    """Broadcast updated listener count"""
-    count = len(active_connections.get(channel_id, []))
-    await broadcast_message(channel_id, {
+        # Clean up slow consumers that exceeded their overflow budget
+        for connection in dropped:
+            for topic in connection_registry.discard(connection):
+                mark_listener_change(topic)
+
+async def broadcast_listener_count(channel_id: str, count: int):
+    """Send updated listener count to this worker's clients"""
+    # Every worker reads the same cluster-wide count, so each delivers locally
+    frame = encode_frame({
         "type": "listener_count",
         "count": count,
         "channel_id": channel_id
     })
+    deliver_local(channel_id, frame)
+    deliver_local(GLOBAL_TOPIC, frame)
 
-# Background task to simulate track changes
 @app.on_event("startup")
 async def startup_event():
-    asyncio.create_task(simulate_playback())
-
-async def simulate_playback():
-    """Simulate track playback and changes"""
-    while True:
-        for channel_id, tracks in MOCK_TRACKS.items():
-            if tracks:
-                current_track = tracks[0]  # Rotate tracks
-                tracks.append(tracks.pop(0))
-                
-                now_playing_data[channel_id] = {
-                    "track": current_track,
-                    "started_at": datetime.now().isoformat(),
-                    "progress": 0
-                }
-                
-                # Broadcast now playing update
-                await broadcast_message(channel_id, {
-                    "type": "now_playing",
-                    "track": current_track,
-                    "channel_id": channel_id,
-                    "progress": 0
-                })
-        
-        await asyncio.sleep(30)  # Change track every 30 seconds
+    # The schema is migrated once before workers start (python -m app.migrations), not here
+    async with AsyncSessionLocal() as db:
+        await crud.seed_database(db, MOCK_CHANNELS, MOCK_TRACKS, MOCK_PROGRAMS)
+        await channel_catalog.load(db)
+    interaction_writer.start()
+    await backplane.start(deliver_local)
+    await cluster_listener_counter.start(listener_count_publisher.mark)
+    playout_scheduler.load(channel_catalog.snapshot)
+    playout_scheduler.start(start_track)
+    listener_count_publisher.start(broadcast_listener_count)
+    heartbeat_wheel.start(reap_connection)
+    like_aggregator.start(broadcast_message)
+    loop_lag_monitor.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await playout_scheduler.stop()
+    await like_aggregator.stop(broadcast_message)
+    await cluster_listener_counter.stop()
+    await backplane.stop()
+    await interaction_writer.stop()
+    # Pooled aiosqlite connections each hold a thread that would keep the process alive
+    await async_engine.dispose()
+
+def start_track(channel_id: str, track: TrackRecord, started_at: float):
+    """Called by the playout scheduler when a channel moves on to its next track"""
+    # Clients derive progress from started_at, so this frame never goes stale
+    frame = encode_frame({
+        "type": "now_playing",
+        "track": track.to_dict(),
+        "channel_id": channel_id,
+        "started_at": started_at,
+        "duration": track.duration or 0
+    })
+    now_playing_data[channel_id] = {
+        "track": track,
+        "started_at": started_at,
+        "frame": frame
+    }
+    response_cache.invalidate("now_playing")
+    
+    # Every worker runs the same epoch-based playout clock, so deliver locally
+    deliver_local(channel_id, frame)
 
 if __name__ == "__main__":
     import uvicorn
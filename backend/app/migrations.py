@@ -0,0 +1,47 @@
+# backend/app/migrations.py
+import logging
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from .database import SQLALCHEMY_DATABASE_URL, create_db_engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+# Schema that Base.metadata.create_all produced before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def alembic_config(url: str = SQLALCHEMY_DATABASE_URL) -> Config:
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    # ConfigParser treats % as interpolation
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def upgrade_database(url: str = SQLALCHEMY_DATABASE_URL):
+    """Migrate the schema to head, adopting databases that predate migrations"""
+    config = alembic_config(url)
+    engine = create_db_engine(url)
+    try:
+        with engine.begin() as connection:
+            config.attributes["connection"] = connection
+            tables = set(inspect(connection).get_table_names())
+            if tables and "alembic_version" not in tables:
+                logger.info(f"Stamping existing schema at revision {BASELINE_REVISION}")
+                command.stamp(config, BASELINE_REVISION)
+            command.upgrade(config, "head")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    # Deploy step: run once before starting the API workers
+    logging.basicConfig(level=logging.INFO)
+    upgrade_database()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, Text, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 import uuid
@@ -35,6 +35,11 @@ class Track(Base):
     play_count = Column(Integer, default=0)
     affiliate_links = Column(JSON)
     cover_art = Column(String(500))
+    
+    # Channel track lists: WHERE channel_id = ? ORDER BY id
+    __table_args__ = (
+        Index("ix_tracks_channel_id_id", "channel_id", "id"),
+    )
 
 class PushSubscription(Base):
     __tablename__ = "push_subscriptions"
@@ -54,6 +59,11 @@ class UserInteraction(Base):
     interaction_type = Column(String(50))  # like, share, dedication
     content = Column(Text)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Interaction history: WHERE channel_id = ? ORDER BY timestamp DESC
+    __table_args__ = (
+        Index("ix_user_interactions_channel_id_timestamp", "channel_id", "timestamp"),
+    )
 
 class Program(Base):
     __tablename__ = "programs"
@@ -66,6 +76,12 @@ class Program(Base):
     schedule = Column(String(100))
     image_url = Column(String(500))
     next_airtime = Column(DateTime(timezone=True))
+    
+    # Upcoming programs, for one channel or across all of them
+    __table_args__ = (
+        Index("ix_programs_channel_id_next_airtime", "channel_id", "next_airtime"),
+        Index("ix_programs_next_airtime", "next_airtime"),
+    )
 
 class Advertisement(Base):
     __tablename__ = "advertisements"
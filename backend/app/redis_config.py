@@ -1,16 +1,97 @@
 # backend/app/redis_simple.py - In-memory Redis replacement
+import asyncio
+import os
+import time
+
+# Set REDIS_URL (e.g. redis://localhost:6379/0) to share state between workers
+REDIS_URL = os.getenv("REDIS_URL")
+
 class SimpleRedis:
     def __init__(self):
         self.data = {}
+        self.expires = {}
         self.pubsub = SimplePubSub()
     
+    def _expire_if_due(self, key):
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            del self.expires[key]
+    
     def get(self, key):
+        self._expire_if_due(key)
         return self.data.get(key)
     
-    def set(self, key, value):
+    def set(self, key, value, ex=None, nx=False):
+        self._expire_if_due(key)
+        if nx and key in self.data:
+            return None
         self.data[key] = value
+        self.expires.pop(key, None)
+        if ex is not None:
+            self.expires[key] = time.monotonic() + ex
+        return True
+    
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            self.expires.pop(key, None)
+            if self.data.pop(key, None) is not None:
+                removed += 1
+        return removed
+    
+    def expire(self, key, seconds):
+        self._expire_if_due(key)
+        if key not in self.data:
+            return False
+        self.expires[key] = time.monotonic() + seconds
         return True
     
+    def hset(self, name, key=None, value=None, mapping=None):
+        self._expire_if_due(name)
+        fields = self.data.setdefault(name, {})
+        if key is not None:
+            mapping = dict(mapping or {}, **{key: value})
+        added = sum(1 for field in mapping if field not in fields)
+        fields.update({field: str(value) for field, value in mapping.items()})
+        return added
+    
+    def hincrby(self, name, key, amount=1):
+        self._expire_if_due(name)
+        fields = self.data.setdefault(name, {})
+        value = int(fields.get(key, 0)) + amount
+        fields[key] = str(value)
+        return value
+    
+    def hgetall(self, name):
+        self._expire_if_due(name)
+        return dict(self.data.get(name, {}))
+    
+    def zadd(self, name, mapping):
+        self._expire_if_due(name)
+        members = self.data.setdefault(name, {})
+        added = sum(1 for member in mapping if member not in members)
+        members.update({member: float(score) for member, score in mapping.items()})
+        return added
+    
+    def zrem(self, name, *values):
+        members = self.data.get(name, {})
+        return sum(1 for value in values if members.pop(value, None) is not None)
+    
+    def zremrangebyscore(self, name, min, max):
+        members = self.data.get(name, {})
+        low, high = float(min), float(max)
+        stale = [member for member, score in members.items() if low <= score <= high]
+        for member in stale:
+            del members[member]
+        return len(stale)
+    
+    def zrange(self, name, start, end):
+        self._expire_if_due(name)
+        ordered = sorted(self.data.get(name, {}).items(), key=lambda item: (item[1], item[0]))
+        members = [member for member, _ in ordered]
+        return members[start:] if end == -1 else members[start:end + 1]
+    
     def publish(self, channel, message):
         self.pubsub.publish(channel, message)
     
@@ -30,6 +111,23 @@ class SimplePubSub:
         if channel not in self.subscribers:
             self.subscribers[channel] = []
         self.subscribers[channel].append(callback)
+    
+    def unsubscribe(self, channel, callback):
+        if callback in self.subscribers.get(channel, []):
+            self.subscribers[channel].remove(callback)
+
+def create_redis_client():
+    """Real Redis when REDIS_URL is configured, the in-memory stand-in otherwise"""
+    if REDIS_URL:
+        import redis
+        return redis.Redis.from_url(REDIS_URL, decode_responses=True)
+    return SimpleRedis()
+
+async def run_redis(client, func, *args, **kwargs):
+    """Call a client method without blocking the event loop on real Redis I/O"""
+    # The in-memory stand-in is not thread-safe and never blocks, so run it inline
+    if isinstance(client, SimpleRedis):
+        return func(*args, **kwargs)
+    return await asyncio.to_thread(func, *args, **kwargs)
 
-# Use this instead of real Redis
-redis_client = SimpleRedis()
\ No newline at end of file
+redis_client = create_redis_client()
\ No newline at end of file
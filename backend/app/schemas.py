@@ -58,8 +58,22 @@ class NowPlayingResponse(BaseModel):
     listeners: int
     progress: int
     duration: int
+    started_at: Optional[float] = None  # Unix seconds, server clock
+    server_time: float
     is_ad: bool
 
+class ChannelNowPlaying(BaseModel):
+    channel_id: str
+    track: Optional[Dict[str, Any]] = None
+    listeners: int
+    duration: int
+    started_at: Optional[float] = None
+    is_ad: bool
+
+class ServerTimeResponse(BaseModel):
+    server_time: float
+    client_time: Optional[float] = None
+
 class UserMessage(BaseModel):
     user_id: str
     channel_id: str
@@ -0,0 +1,182 @@
+# backend/app/services/backplane.py
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+from ..redis_config import REDIS_URL, SimpleRedis, redis_client
+from .frames import Frame, encode_frame
+
+logger = logging.getLogger(__name__)
+
+# One pub/sub channel carries broadcasts for every radio channel
+BROADCAST_CHANNEL = "ws:broadcast"
+SEQ_KEY_PREFIX = "ws:seq:"
+RECONNECT_DELAY = 1.0
+
+# INCR and PUBLISH in one script: no other publish can land between them
+PUBLISH_SEQUENCED_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('PUBLISH', KEYS[2], ARGV[1] .. seq .. ARGV[2] .. seq .. ARGV[3])
+return seq
+"""
+
+Deliver = Callable[[str, Frame], None]
+
+
+def encode_envelope(channel_id: str, frame: Frame) -> str:
+    """Routing header on the first line, the already-encoded frame after it"""
+    return json.dumps([channel_id, frame.type, frame.seq]) + "\n" + frame.text
+
+
+def sequenced_envelope(channel_id: str, message: dict) -> Tuple[str, str, str]:
+    """An envelope split around its two seq slots: header and frame text
+
+    The seq is filled in by whoever assigns it, so assigning and publishing
+    can happen in one atomic step. The result joins as a + seq + b + seq + c.
+    """
+    text = encode_frame({**message, "channel_id": channel_id}, channel_id).text
+    header = json.dumps([channel_id, message.get("type")])
+    return header[:-1] + ",", "]\n" + text[:-1] + ',"seq":', "}"
+
+
+def decode_envelope(data: str) -> Tuple[str, Frame]:
+    header, text = data.split("\n", 1)
+    channel_id, message_type, seq = json.loads(header)
+    return channel_id, Frame(message_type, channel_id, text, seq)
+
+
+class Backplane(ABC):
+    """Publishes each broadcast once and delivers it on every worker process"""
+
+    def __init__(self):
+        self.published = 0
+        self.received = 0
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def stop(self):
+        self._deliver = None
+
+    @abstractmethod
+    async def publish(self, channel_id: str, frame: Frame):
+        """Deliver an already-encoded frame on every worker"""
+
+    @abstractmethod
+    async def publish_sequenced(self, channel_id: str, message: dict) -> int:
+        """Give a message the channel's next sequence number and publish it, atomically
+
+        Workers therefore receive each channel's events in seq order.
+        """
+
+    def _on_message(self, data: str):
+        try:
+            channel_id, frame = decode_envelope(data)
+        except Exception as e:
+            logger.error(f"Discarding malformed backplane message: {e!r}")
+            return
+        self.received += 1
+        if self._deliver:
+            self._deliver(channel_id, frame)
+
+    def stats(self):
+        return {
+            "backend": type(self).__name__,
+            "published": self.published,
+            "received": self.received,
+        }
+
+
+class LocalBackplane(Backplane):
+    """Single-process backplane over the in-memory SimplePubSub"""
+
+    def __init__(self, client: SimpleRedis):
+        super().__init__()
+        self.pubsub = client.pubsub
+        self._seqs: Dict[str, int] = {}
+
+    async def start(self, deliver: Deliver):
+        await super().start(deliver)
+        self.pubsub.subscribe(BROADCAST_CHANNEL, self._on_message)
+
+    async def stop(self):
+        self.pubsub.unsubscribe(BROADCAST_CHANNEL, self._on_message)
+        await super().stop()
+
+    async def publish(self, channel_id: str, frame: Frame):
+        self.published += 1
+        self.pubsub.publish(BROADCAST_CHANNEL, encode_envelope(channel_id, frame))
+
+    async def publish_sequenced(self, channel_id: str, message: dict) -> int:
+        head, middle, tail = sequenced_envelope(channel_id, message)
+        # No await between assigning and publishing, so this is atomic in-process
+        seq = self._seqs.get(channel_id, 0) + 1
+        self._seqs[channel_id] = seq
+        self.published += 1
+        self.pubsub.publish(BROADCAST_CHANNEL, f"{head}{seq}{middle}{seq}{tail}")
+        return seq
+
+
+class RedisBackplane(Backplane):
+    """Redis pub/sub backplane shared by every worker and node"""
+
+    def __init__(self, url: str):
+        super().__init__()
+        from redis import asyncio as aioredis
+        self.client = aioredis.Redis.from_url(url, decode_responses=True)
+        self._publish_sequenced = self.client.register_script(PUBLISH_SEQUENCED_SCRIPT)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Deliver):
+        await super().start(deliver)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        await self.client.close()
+        await super().stop()
+
+    async def publish(self, channel_id: str, frame: Frame):
+        self.published += 1
+        await self.client.publish(BROADCAST_CHANNEL, encode_envelope(channel_id, frame))
+
+    async def publish_sequenced(self, channel_id: str, message: dict) -> int:
+        self.published += 1
+        return await self._publish_sequenced(
+            keys=[SEQ_KEY_PREFIX + channel_id, BROADCAST_CHANNEL],
+            args=list(sequenced_envelope(channel_id, message))
+        )
+
+    async def _listen(self):
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(BROADCAST_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Backplane subscription lost, retrying: {e!r}")
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                await pubsub.close()
+
+
+def create_backplane() -> Backplane:
+    if REDIS_URL:
+        return RedisBackplane(REDIS_URL)
+    return LocalBackplane(redis_client)
+
+
+# Global instance
+backplane = create_backplane()
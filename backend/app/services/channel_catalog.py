@@ -0,0 +1,86 @@
+# backend/app/services/channel_catalog.py
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import crud
+from .http_cache import response_cache
+from .records import ChannelRecord, TrackRecord
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogSnapshot:
+    """Immutable, fully indexed view of every channel and its tracks
+
+    Built in one go and swapped in with a single assignment, so readers
+    always see a consistent catalog and never need a lock.
+    """
+
+    __slots__ = ("version", "channels", "by_id", "by_genre", "by_live", "tracks")
+
+    def __init__(self, channels: Iterable[ChannelRecord], tracks: Iterable[TrackRecord], version: int):
+        self.version = version
+        self.channels: Tuple[ChannelRecord, ...] = tuple(channels)
+        self.by_id: Dict[str, ChannelRecord] = {c.id: c for c in self.channels}
+        by_genre: Dict[str, List[ChannelRecord]] = {}
+        by_live: Dict[bool, List[ChannelRecord]] = {True: [], False: []}
+        for channel in self.channels:
+            by_genre.setdefault((channel.genre or "").lower(), []).append(channel)
+            by_live[bool(channel.is_live)].append(channel)
+        self.by_genre: Dict[str, Tuple[ChannelRecord, ...]] = {g: tuple(c) for g, c in by_genre.items()}
+        self.by_live: Dict[bool, Tuple[ChannelRecord, ...]] = {live: tuple(c) for live, c in by_live.items()}
+        by_channel: Dict[str, List[TrackRecord]] = {}
+        for track in tracks:
+            by_channel.setdefault(track.channel_id, []).append(track)
+        self.tracks: Dict[str, Tuple[TrackRecord, ...]] = {ch: tuple(t) for ch, t in by_channel.items()}
+
+
+class ChannelCatalog:
+    """Channels and tracks loaded from the database with O(1) lookup by id, genre and live status"""
+
+    def __init__(self):
+        self.snapshot = CatalogSnapshot((), (), 0)
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    def get(self, channel_id: str) -> Optional[ChannelRecord]:
+        return self.snapshot.by_id.get(channel_id)
+
+    def has_genre(self, genre: str) -> bool:
+        return genre.lower() in self.snapshot.by_genre
+
+    def list(self, genre: Optional[str] = None, is_live: Optional[bool] = None) -> Tuple[ChannelRecord, ...]:
+        snapshot = self.snapshot
+        # An empty genre means no filter, as it always has
+        if not genre:
+            channels = snapshot.channels if is_live is None else snapshot.by_live[is_live]
+        else:
+            channels = snapshot.by_genre.get(genre.lower(), ())
+            if is_live is not None:
+                channels = tuple(c for c in channels if bool(c.is_live) == is_live)
+        return channels
+
+    def tracks(self, channel_id: str) -> Tuple[TrackRecord, ...]:
+        return self.snapshot.tracks.get(channel_id, ())
+
+    async def load(self, db: AsyncSession):
+        """Rebuild from the database and publish the new snapshot atomically"""
+        channels = await crud.list_channels(db)
+        tracks = await crud.list_tracks(db)
+        self.publish(
+            [ChannelRecord.from_model(channel) for channel in channels],
+            [TrackRecord.from_model(track) for track in tracks]
+        )
+
+    def publish(self, channels: Iterable[ChannelRecord], tracks: Iterable[TrackRecord]):
+        self.snapshot = CatalogSnapshot(channels, tracks, self.snapshot.version + 1)
+        response_cache.invalidate("channels", "tracks")
+        logger.info(f"Channel catalog v{self.snapshot.version}: {len(self.snapshot.channels)} channels")
+
+
+# Global instance
+channel_catalog = ChannelCatalog()
@@ -0,0 +1,177 @@
+# backend/app/services/connection.py
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from fastapi import WebSocket
+
+from .frames import Frame
+from .metrics import LatencyWindow
+
+if TYPE_CHECKING:
+    from .rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Deadline for a single socket send before the client is considered stalled
+SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "2.0"))
+# Frames a connection may have pending before its slow-consumer policy applies
+QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "64"))
+# Overflows tolerated before a slow consumer that never catches up is disconnected
+MAX_OVERFLOWS = int(os.getenv("WS_MAX_OVERFLOWS", "32"))
+
+# Slow-consumer policies
+COALESCE = "coalesce"        # keep only the latest pending frame of this type
+DROP = "drop"                # discard the new frame when the queue is full
+DROP_OLDEST = "drop_oldest"  # discard the oldest queued frame to make room
+DISCONNECT = "disconnect"    # disconnect as soon as the queue is full
+
+SEND_POLICIES: Dict[str, str] = {
+    "listener_count": COALESCE,
+    "now_playing": COALESCE,
+    "track_like": DROP,
+}
+DEFAULT_POLICY = DROP_OLDEST
+
+# Time frames spend queued until their send completes, across all connections
+delivery_latency = LatencyWindow()
+
+
+class Connection:
+    """A client socket with its own bounded outbound queue drained by a writer task"""
+
+    def __init__(self, websocket: Optional[WebSocket], max_queue: int = QUEUE_SIZE, max_overflows: int = MAX_OVERFLOWS,
+                 send_timeout: float = SEND_TIMEOUT, policies: Optional[Dict[str, str]] = None):
+        self.websocket = websocket
+        # Peer address as seen by the server, which a client can't choose the way it picks a user_id
+        self.client_host: Optional[str] = websocket.client.host if websocket is not None and websocket.client else None
+        # Topics (channel ids or the global summary) this connection follows
+        self.topics: Dict[str, None] = {}
+        self.max_queue = max_queue
+        self.max_overflows = max_overflows
+        self.send_timeout = send_timeout
+        self.policies = SEND_POLICIES if policies is None else policies
+        self.overflows = 0
+        self.closed = False
+        # Liveness, maintained by inbound traffic and the heartbeat wheel
+        self.last_seen = time.monotonic()
+        self.ping_sent_at: Optional[float] = None
+        # Inbound message rate limits, one token bucket per message type
+        self.rate_buckets: Dict[str, "TokenBucket"] = {}
+        # Entries are (enqueued_at, frame) or (enqueued_at, coalesce key)
+        self._queue = deque()
+        self._latest: Dict[tuple, Frame] = {}
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._writer = asyncio.create_task(self._drain())
+
+    def touch(self):
+        """Record inbound traffic from the client"""
+        self.last_seen = time.monotonic()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def accepts(self, frame_type: str) -> bool:
+        """Whether frames of this type are delivered to the client at all"""
+        return True
+
+    def send(self, frame: Frame) -> bool:
+        """Queue a frame without blocking; returns False once the connection is dropped"""
+        if self.closed:
+            return False
+
+        policy = self.policies.get(frame.type, DEFAULT_POLICY)
+        if policy == COALESCE:
+            key = (frame.type, frame.channel_id)
+            if key in self._latest:
+                self._latest[key] = frame
+                return True
+            entry = key
+        else:
+            entry = frame
+
+        if len(self._queue) >= self.max_queue:
+            self.overflows += 1
+            if policy == DISCONNECT or self.overflows >= self.max_overflows:
+                self.close()
+                return False
+            if policy == DROP:
+                return True
+            self._discard_oldest()
+
+        if policy == COALESCE:
+            self._latest[entry] = frame
+        self._queue.append((time.perf_counter(), entry))
+        self._ready.set()
+        return True
+
+    def _discard_oldest(self):
+        _, entry = self._queue.popleft()
+        if isinstance(entry, tuple):
+            self._latest.pop(entry, None)
+
+    async def next_frame(self, timeout: Optional[float] = None) -> Optional[Tuple[float, Frame]]:
+        """Wait for the next queued (enqueued_at, frame); None on timeout or once closed"""
+        while not self._queue:
+            if self.closed:
+                return None
+            # Caught up: the client is no longer backed up
+            self.overflows = 0
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        enqueued_at, entry = self._queue.popleft()
+        frame = self._latest.pop(entry) if isinstance(entry, tuple) else entry
+        return enqueued_at, frame
+
+    async def _drain(self):
+        try:
+            while True:
+                item = await self.next_frame()
+                if item is None:
+                    break
+                enqueued_at, frame = item
+                await asyncio.wait_for(self.websocket.send_text(frame.text), self.send_timeout)
+                delivery_latency.record(time.perf_counter() - enqueued_at)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.info(f"Dropping connection following {list(self.topics)}: {e!r}")
+            self.close()
+
+    def close(self, code: int = 1011):
+        """Stop writing and close the socket in the background"""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        self._latest.clear()
+        self._ready.set()
+        asyncio.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code), self.send_timeout)
+        except Exception:
+            pass
+
+    async def stop(self):
+        """Cancel the writer once the client has gone away"""
+        self.closed = True
+        self._queue.clear()
+        self._latest.clear()
+        if self._writer:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
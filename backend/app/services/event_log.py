@@ -0,0 +1,109 @@
+# backend/app/services/event_log.py
+import os
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from .frames import Frame
+
+# Recent events kept per channel for clients resuming after a reconnect
+EVENT_LOG_SIZE = int(os.getenv("EVENT_LOG_SIZE", "256"))
+
+
+class ChannelEventLog:
+    """Bounded ring buffer of a channel's recent frames ordered by sequence number"""
+
+    def __init__(self, size: int = EVENT_LOG_SIZE):
+        self.events = deque(maxlen=size)
+
+    @property
+    def head(self) -> Optional[int]:
+        return self.events[-1].seq if self.events else None
+
+    def append(self, frame: Frame):
+        """Insert in seq order; duplicates and frames older than the whole log are ignored"""
+        events = self.events
+        if not events or frame.seq > events[-1].seq:
+            events.append(frame)
+            return
+        # Late arrivals are rare and land near the tail, so search from the right
+        index = len(events)
+        while index and events[index - 1].seq > frame.seq:
+            index -= 1
+        if index and events[index - 1].seq == frame.seq:
+            return
+        if len(events) == events.maxlen:
+            if index == 0:
+                return
+            events.popleft()
+            index -= 1
+        events.insert(index, frame)
+
+    def since(self, last_seq: int) -> Optional[List[Frame]]:
+        """Frames after last_seq, or None when the log can't replay the gap without holes"""
+        if not self.events or last_seq < self.events[0].seq - 1 or last_seq > self.events[-1].seq:
+            return None
+        missed = []
+        for frame in reversed(self.events):
+            if frame.seq <= last_seq:
+                break
+            missed.append(frame)
+        missed.reverse()
+        # A frame that never reached this worker would otherwise be skipped silently
+        expected = last_seq + 1
+        for frame in missed:
+            if frame.seq != expected:
+                return None
+            expected += 1
+        return missed
+
+
+class EventLogStore:
+    """Per-channel event logs for this worker"""
+
+    def __init__(self, size: int = EVENT_LOG_SIZE):
+        self.size = size
+        self.logs: Dict[str, ChannelEventLog] = {}
+        self.resumed = 0
+        self.resyncs = 0
+
+    def record(self, channel_id: str, frame: Frame):
+        log = self.logs.get(channel_id)
+        if log is None:
+            log = self.logs[channel_id] = ChannelEventLog(self.size)
+        log.append(frame)
+
+    def head(self, channel_id: str) -> Optional[int]:
+        log = self.logs.get(channel_id)
+        return log.head if log else None
+
+    def since(
+        self,
+        channel_id: str,
+        last_seq: int,
+        limit: int,
+        accepts: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[List[Frame]]:
+        """Missed frames to replay, or None when the client needs a full snapshot
+
+        Frames the client does not accept are dropped before applying the limit.
+        """
+        log = self.logs.get(channel_id)
+        missed = log.since(last_seq) if log else None
+        if missed is not None and accepts is not None:
+            missed = [frame for frame in missed if accepts(frame.type)]
+        if missed is None or len(missed) > limit:
+            self.resyncs += 1
+            return None
+        self.resumed += 1
+        return missed
+
+    def stats(self) -> Dict:
+        return {
+            "channels": len(self.logs),
+            "resumed": self.resumed,
+            "resyncs": self.resyncs,
+        }
+
+
+# Global instance
+event_logs = EventLogStore()
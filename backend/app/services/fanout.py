@@ -0,0 +1,61 @@
+# backend/app/services/fanout.py
+import logging
+import time
+from typing import Dict, Iterable, List
+
+from .connection import Connection, delivery_latency
+from .frames import Frame
+from .metrics import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastStats:
+    """Broadcast counters plus rolling broadcast and delivery latencies"""
+
+    def __init__(self):
+        self.broadcasts = 0
+        self.deliveries = 0
+        self.evictions = 0
+        self.duration = LatencyWindow()
+
+    def record(self, duration: float, recipients: int, evicted: int):
+        self.duration.record(duration)
+        self.broadcasts += 1
+        self.deliveries += recipients - evicted
+        self.evictions += evicted
+
+    def snapshot(self) -> Dict:
+        return {
+            "broadcasts": self.broadcasts,
+            "deliveries": self.deliveries,
+            "evictions": self.evictions,
+            "duration_ms": self.duration.snapshot(),
+            "delivery_ms": delivery_latency.snapshot(),
+        }
+
+
+class FanoutEngine:
+    """Hands one frame to many connection queues without waiting on any socket"""
+
+    def __init__(self):
+        self.stats = BroadcastStats()
+
+    def fan_out(self, connections: Iterable[Connection], frame: Frame) -> List[Connection]:
+        """Queue frame on every connection and return the ones that had to be dropped"""
+        start = time.perf_counter()
+        recipients = 0
+        failed = []
+        for connection in connections:
+            recipients += 1
+            if not connection.send(frame):
+                failed.append(connection)
+        duration = time.perf_counter() - start
+        self.stats.record(duration, recipients, len(failed))
+        if failed:
+            logger.info(f"Dropping {len(failed)} of {recipients} slow connections on channel {frame.channel_id}")
+        return failed
+
+
+# Global instance
+fanout_engine = FanoutEngine()
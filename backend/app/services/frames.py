@@ -0,0 +1,39 @@
+# backend/app/services/frames.py
+import json
+from typing import Optional
+
+# Compact separators: every byte saved here is saved once per recipient
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+class Frame:
+    """A message serialized once and shared by every recipient"""
+
+    __slots__ = ("type", "channel_id", "text", "seq", "_sse")
+
+    def __init__(self, type: Optional[str], channel_id: Optional[str], text: str, seq: Optional[int] = None):
+        self.type = type
+        self.channel_id = channel_id
+        self.text = text
+        # Position in the channel event log; None for ephemeral frames
+        self.seq = seq
+        self._sse: Optional[bytes] = None
+
+    @property
+    def sse(self) -> bytes:
+        """Server-Sent Events encoding, built once and shared by every stream"""
+        if self._sse is None:
+            lines = f"id: {self.seq}\n" if self.seq is not None else ""
+            # Compact JSON escapes newlines, so the payload is always one data line
+            lines += f"event: {self.type}\ndata: {self.text}\n\n"
+            self._sse = lines.encode()
+        return self._sse
+
+    def __repr__(self):
+        return f"Frame(type={self.type!r}, channel_id={self.channel_id!r}, seq={self.seq!r}, size={len(self.text)})"
+
+
+def encode_frame(message: dict, channel_id: Optional[str] = None) -> Frame:
+    """Serialize a message once for broadcasting"""
+    return Frame(message.get("type"), channel_id or message.get("channel_id"),
+                 _encoder.encode(message), message.get("seq"))
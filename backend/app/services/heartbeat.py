@@ -0,0 +1,107 @@
+# backend/app/services/heartbeat.py
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from .connection import Connection
+from .frames import encode_frame
+
+logger = logging.getLogger(__name__)
+
+# Ping a connection after this many seconds without inbound traffic
+HEARTBEAT_IDLE = float(os.getenv("WS_HEARTBEAT_IDLE", "25"))
+# Reap it if nothing arrives within this many seconds of the ping
+HEARTBEAT_TIMEOUT = float(os.getenv("WS_HEARTBEAT_TIMEOUT", "10"))
+HEARTBEAT_TICK = float(os.getenv("WS_HEARTBEAT_TICK", "1.0"))
+
+PING_FRAME = encode_frame({"type": "ping"})
+
+
+class HeartbeatWheel:
+    """One timer wheel that pings idle connections and reaps unresponsive ones
+
+    Each connection sits in exactly one slot. Inbound traffic only updates
+    Connection.last_seen; the connection is re-examined when its slot comes
+    round, so activity never costs a reschedule and there is no task per socket.
+    """
+
+    def __init__(self, idle: float = HEARTBEAT_IDLE, timeout: float = HEARTBEAT_TIMEOUT,
+                 tick: float = HEARTBEAT_TICK):
+        self.idle = idle
+        self.timeout = timeout
+        self.tick = tick
+        self.slots: List[Dict[Connection, None]] = [
+            {} for _ in range(math.ceil(max(idle, timeout) / tick) + 1)
+        ]
+        self.position = 0
+        self.pings_sent = 0
+        self.reaped = 0
+        self._slot_of: Dict[Connection, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def track(self, connection: Connection):
+        connection.touch()
+        self._schedule(connection, self.idle)
+
+    def untrack(self, connection: Connection):
+        slot = self._slot_of.pop(connection, None)
+        if slot is not None:
+            self.slots[slot].pop(connection, None)
+
+    def _schedule(self, connection: Connection, delay: float):
+        ticks = min(len(self.slots) - 1, max(1, math.ceil(delay / self.tick)))
+        slot = (self.position + ticks) % len(self.slots)
+        self.slots[slot][connection] = None
+        self._slot_of[connection] = slot
+
+    def start(self, reap: Callable[[Connection], None]):
+        self._task = asyncio.create_task(self._run(reap))
+
+    async def _run(self, reap: Callable[[Connection], None]):
+        while True:
+            await asyncio.sleep(self.tick)
+            try:
+                self.advance(reap)
+            except Exception as e:
+                logger.error(f"Heartbeat tick failed: {e!r}")
+
+    def advance(self, reap: Callable[[Connection], None]):
+        """Move the wheel one slot and handle every connection due in it"""
+        self.position = (self.position + 1) % len(self.slots)
+        due, self.slots[self.position] = self.slots[self.position], {}
+        now = time.monotonic()
+
+        for connection in due:
+            del self._slot_of[connection]
+            if connection.closed:
+                continue
+
+            if connection.ping_sent_at is not None and connection.last_seen < connection.ping_sent_at:
+                # Pinged and silent past the deadline: treat as half-open
+                self.reaped += 1
+                reap(connection)
+                continue
+
+            idle_for = now - connection.last_seen
+            if idle_for >= self.idle:
+                connection.ping_sent_at = now
+                connection.send(PING_FRAME)
+                self.pings_sent += 1
+                self._schedule(connection, self.timeout)
+            else:
+                connection.ping_sent_at = None
+                self._schedule(connection, self.idle - idle_for)
+
+    def stats(self) -> Dict:
+        return {
+            "tracked": len(self._slot_of),
+            "pings_sent": self.pings_sent,
+            "reaped": self.reaped,
+        }
+
+
+# Global instance
+heartbeat_wheel = HeartbeatWheel()
@@ -0,0 +1,236 @@
+# backend/app/services/http_cache.py
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from fastapi import Request, Response
+
+# Revalidate on every use: a 304 is cheap and listener counts change often
+REVALIDATE = "public, no-cache"
+# ETags remembered per (resource, query) before the oldest are forgotten
+MAX_ETAGS = 1024
+# Serialized response bodies kept in memory before the least recently used go
+RESPONSE_CACHE_BYTES = int(os.getenv("RESPONSE_CACHE_BYTES", str(8 * 1024 * 1024)))
+# Charged per entry on top of its body for the key, tag sets and bookkeeping, so many
+# tiny bodies can't grow memory far past the budget
+RESPONSE_CACHE_ENTRY_OVERHEAD = int(os.getenv("RESPONSE_CACHE_ENTRY_OVERHEAD", "512"))
+
+
+class ResourceVersions:
+    """Monotonic version counter per resource, bumped whenever its content changes"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+
+    def get(self, name: str) -> int:
+        return self._versions.get(name, 0)
+
+    def bump(self, name: str):
+        self._versions[name] = self._versions.get(name, 0) + 1
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag from the body itself, so every worker agrees on it"""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+class ETagStore:
+    """Remembers the ETag of each resource version to answer 304 without a body"""
+
+    def __init__(self, max_entries: int = MAX_ETAGS):
+        self.max_entries = max_entries
+        self._etags: "OrderedDict[Hashable, Tuple[Hashable, str]]" = OrderedDict()
+        self.not_modified = 0
+        self.built = 0
+
+    def lookup(self, key: Hashable, version: Hashable) -> Optional[str]:
+        entry = self._etags.get(key)
+        if entry is None or entry[0] != version:
+            return None
+        self._etags.move_to_end(key)
+        return entry[1]
+
+    def remember(self, key: Hashable, version: Hashable, etag: str):
+        self._etags[key] = (version, etag)
+        self._etags.move_to_end(key)
+        if len(self._etags) > self.max_entries:
+            self._etags.popitem(last=False)
+
+    def respond(self, request: Request, key: Hashable, version: Hashable,
+                build: Callable[[], bytes], cache_control: str = REVALIDATE) -> Response:
+        """JSON response with ETag, or 304 when the client already has this version"""
+        response = self._not_modified(request, key, version, cache_control)
+        if response is not None:
+            return response
+        return self._send(request, key, version, build(), cache_control)
+
+    async def respond_async(self, request: Request, key: Hashable, version: Hashable,
+                            build: Callable[[], Awaitable[bytes]], cache_control: str = REVALIDATE) -> Response:
+        """respond() for bodies that need I/O, such as a database query, to build"""
+        response = self._not_modified(request, key, version, cache_control)
+        if response is not None:
+            return response
+        return self._send(request, key, version, await build(), cache_control)
+
+    def _not_modified(self, request: Request, key: Hashable, version: Hashable,
+                      cache_control: str) -> Optional[Response]:
+        etag = self.lookup(key, version)
+        if etag is not None and etag_matches(request, etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+        return None
+
+    def _send(self, request: Request, key: Hashable, version: Hashable,
+              body: bytes, cache_control: str) -> Response:
+        self.built += 1
+        etag = content_etag(body)
+        self.remember(key, version, etag)
+        if etag_matches(request, etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+        return Response(body, media_type="application/json",
+                        headers={"ETag": etag, "Cache-Control": cache_control})
+
+    def stats(self) -> Dict:
+        return {
+            "not_modified": self.not_modified,
+            "built": self.built,
+            "etags": len(self._etags),
+        }
+
+
+class OverlayTemplate:
+    """A serialized body with holes for values that change faster than the rest
+
+    The body is rendered with a unique negative placeholder per hole, then split
+    around them, so filling in fresh values is a join instead of a re-serialize.
+    """
+
+    __slots__ = ("chunks", "keys", "size")
+
+    def __init__(self, body: bytes, field: str, keys: List[str]):
+        self.keys = keys
+        self.chunks = [body]
+        for index in range(len(keys)):
+            head, _, tail = self.chunks.pop().partition(self.placeholder(field, index))
+            self.chunks.extend((head + f'"{field}":'.encode(), tail))
+        self.size = sum(len(chunk) for chunk in self.chunks)
+
+    @staticmethod
+    def placeholder(field: str, index: int) -> bytes:
+        # Quotes inside JSON strings are escaped, so this can only match a key
+        return f'"{field}":{-(index + 1)}'.encode()
+
+    def render(self, value: Callable[[str], int]) -> bytes:
+        parts = [self.chunks[0]]
+        for key, chunk in zip(self.keys, self.chunks[1:]):
+            parts.append(str(value(key)).encode())
+            parts.append(chunk)
+        return b"".join(parts)
+
+
+CacheValue = Union[bytes, OverlayTemplate]
+
+
+class ResponseCache:
+    """LRU of serialized response bodies, invalidated by domain events rather than TTLs
+
+    Entries are tagged with the resources they were built from; invalidating a
+    tag drops its entries and bumps its version so ETags change with it.
+    """
+
+    def __init__(self, versions: ResourceVersions, max_bytes: int = RESPONSE_CACHE_BYTES):
+        self.versions = versions
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[CacheValue, Tuple[str, ...]]]" = OrderedDict()
+        self._tagged: Dict[str, Set[Hashable]] = {}
+
+    @staticmethod
+    def _size(value: CacheValue) -> int:
+        body = value.size if isinstance(value, OverlayTemplate) else len(value)
+        return body + RESPONSE_CACHE_ENTRY_OVERHEAD
+
+    def get_or_build(self, key: Hashable, tags: Iterable[str], build: Callable[[], CacheValue]) -> CacheValue:
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, tags, build())
+        return value
+
+    async def get_or_build_async(self, key: Hashable, tags: Iterable[str],
+                                 build: Callable[[], Awaitable[CacheValue]]) -> CacheValue:
+        value = self.get(key)
+        if value is None:
+            tags = tuple(tags)
+            versions = [self.versions.get(tag) for tag in tags]
+            value = await build()
+            # Don't keep a body whose resources were invalidated while it was being built
+            if versions == [self.versions.get(tag) for tag in tags]:
+                self.put(key, tags, value)
+        return value
+
+    def get(self, key: Hashable) -> Optional[CacheValue]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, tags: Iterable[str], value: CacheValue) -> CacheValue:
+        if key in self._entries:
+            self._evict(key)
+        tags = tuple(tags)
+        self._entries[key] = (value, tags)
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        self.bytes += self._size(value)
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            self._evict(next(iter(self._entries)))
+        return value
+
+    def _evict(self, key: Hashable):
+        value, tags = self._entries.pop(key)
+        self.bytes -= self._size(value)
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def invalidate(self, *tags: str):
+        """A resource changed: drop every body built from it"""
+        for tag in tags:
+            self.versions.bump(tag)
+            for key in list(self._tagged.get(tag, ())):
+                self._evict(key)
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Global instances
+resource_versions = ResourceVersions()
+etag_store = ETagStore()
+response_cache = ResponseCache(resource_versions)
@@ -0,0 +1,168 @@
+# backend/app/services/interactions.py
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .. import crud
+from ..database import AsyncSessionLocal
+from .metrics import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+# Flush once this many interactions are buffered...
+INTERACTION_BATCH_SIZE = int(os.getenv("INTERACTION_BATCH_SIZE", "500"))
+# ...or this many seconds after the writer picks up the first of a batch
+INTERACTION_FLUSH_INTERVAL = float(os.getenv("INTERACTION_FLUSH_INTERVAL", "1.0"))
+# Buffered interactions beyond this make producers wait
+INTERACTION_MAX_PENDING = int(os.getenv("INTERACTION_MAX_PENDING", "20000"))
+# How long a producer waits for room before its interaction is rejected
+INTERACTION_PUT_TIMEOUT = float(os.getenv("INTERACTION_PUT_TIMEOUT", "0.5"))
+
+
+def interaction_row(user_id: Optional[str], channel_id: str, interaction_type: str,
+                    content: Optional[str], timestamp: Optional[datetime] = None,
+                    interaction_id: Optional[str] = None) -> Dict:
+    return {
+        "id": interaction_id or str(uuid.uuid4()),
+        "user_id": user_id,
+        "channel_id": channel_id,
+        "interaction_type": interaction_type,
+        "content": content,
+        "timestamp": timestamp or datetime.now(),
+    }
+
+
+class InteractionWriter:
+    """Write-behind buffer that persists UserInteraction rows as bulk inserts
+
+    Producers append rows and return immediately; one writer task flushes a
+    batch when it is full or old enough. Memory is bounded by max_pending:
+    when the buffer is full, put() waits for the writer to make room, which
+    slows the producing socket or request instead of growing without limit.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, batch_size: int = INTERACTION_BATCH_SIZE,
+                 interval: float = INTERACTION_FLUSH_INTERVAL, max_pending: int = INTERACTION_MAX_PENDING):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_pending = max_pending
+        self.written = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.flush_latency = LatencyWindow()
+        self._buffer: Deque[Dict] = deque()
+        self._has_rows = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def offer(self, row: Dict) -> bool:
+        """Buffer a row without waiting; False if the buffer is full"""
+        if self._closing or len(self._buffer) >= self.max_pending:
+            self.rejected += 1
+            return False
+        self._buffer.append(row)
+        self._has_rows.set()
+        if len(self._buffer) >= self.batch_size:
+            self._batch_full.set()
+        return True
+
+    async def put(self, row: Dict, timeout: float = INTERACTION_PUT_TIMEOUT) -> bool:
+        """Buffer a row, waiting up to timeout for room; False if it was rejected"""
+        deadline = time.monotonic() + timeout
+        while len(self._buffer) >= self.max_pending and not self._closing:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._has_room.clear()
+            try:
+                await asyncio.wait_for(self._has_room.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return self.offer(row)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop accepting rows and flush everything still buffered"""
+        self._closing = True
+        self._has_rows.set()
+        self._batch_full.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+    async def _run(self):
+        while True:
+            if not self._buffer:
+                if self._closing:
+                    return
+                self._has_rows.clear()
+                await self._has_rows.wait()
+                continue
+
+            if len(self._buffer) < self.batch_size and not self._closing:
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            count = min(self.batch_size, len(self._buffer))
+            batch = [self._buffer.popleft() for _ in range(count)]
+            self._has_room.set()
+            await self.flush(batch)
+
+    async def flush(self, batch: List[Dict]):
+        started = time.perf_counter()
+        try:
+            await self._insert(batch)
+        except Exception as e:
+            # One bad row fails the whole statement; retry singly so only it is lost
+            logger.warning(f"Bulk insert of {len(batch)} interactions failed, retrying row by row: {e!r}")
+            for row in batch:
+                try:
+                    await self._insert([row])
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"Failed to write interaction {row.get('id')}: {e!r}")
+                else:
+                    self.written += 1
+        else:
+            self.written += len(batch)
+        self.batches += 1
+        self.flush_latency.record(time.perf_counter() - started)
+
+    async def _insert(self, rows: List[Dict]):
+        async with self.session_factory() as db:
+            await crud.insert_interactions(db, rows)
+
+    def stats(self) -> Dict:
+        return {
+            "pending": len(self._buffer),
+            "written": self.written,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "flush_ms": self.flush_latency.snapshot(),
+        }
+
+
+# Global instance
+interaction_writer = InteractionWriter(AsyncSessionLocal)
@@ -0,0 +1,113 @@
+# backend/app/services/likes.py
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from ..redis_config import redis_client, run_redis
+
+logger = logging.getLogger(__name__)
+
+# One track_like_summary per (channel, track) per interval instead of one frame per like
+LIKE_FLUSH_INTERVAL = float(os.getenv("LIKE_FLUSH_INTERVAL", "2.0"))
+# Seconds a (channel, track, user) like is remembered for de-duplication
+LIKE_DEDUP_TTL = int(os.getenv("LIKE_DEDUP_TTL", str(24 * 3600)))
+
+TOTALS_KEY_PREFIX = "likes:"
+SEEN_KEY_PREFIX = "likes:seen:"
+ANONYMOUS_USERS = (None, "", "anonymous")
+
+Publish = Callable[[str, dict], Awaitable[None]]
+
+
+def seen_key(channel_id: str, track_id: str, user_id) -> str:
+    """Dedup key from a stable digest; hash() is salted per process, so workers would disagree"""
+    like = "\0".join((channel_id, track_id, str(user_id)))
+    return SEEN_KEY_PREFIX + hashlib.blake2b(like.encode(), digest_size=12).hexdigest()
+
+
+class LikeAggregator:
+    """Accumulates likes per (channel, track) and publishes them as periodic summaries
+
+    Repeat likes are detected cluster-wide: each like claims a key in the shared
+    store, so a user's second like is dropped whichever worker it reaches.
+    """
+
+    def __init__(self, client, interval: float = LIKE_FLUSH_INTERVAL, dedup_ttl: int = LIKE_DEDUP_TTL):
+        self.client = client
+        self.interval = interval
+        self.dedup_ttl = dedup_ttl
+        self.accepted = 0
+        self.duplicates = 0
+        self.summaries = 0
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def claim(self, channel_id: str, track_id: str, user_id) -> bool:
+        """Record a user's like for the whole cluster; False if it is a repeat"""
+        if user_id in ANONYMOUS_USERS:
+            return True
+        claimed = await run_redis(self.client, self.client.set, seen_key(channel_id, track_id, user_id), "1",
+                                  ex=self.dedup_ttl, nx=True)
+        if not claimed:
+            self.duplicates += 1
+        return bool(claimed)
+
+    async def release(self, channel_id: str, track_id: str, user_id):
+        """Forget a claimed like that was never stored, so the user's retry counts"""
+        if user_id not in ANONYMOUS_USERS:
+            await run_redis(self.client, self.client.delete, seen_key(channel_id, track_id, user_id))
+
+    def add(self, channel_id: str, track_id: str):
+        """Count a claimed like towards the next summary"""
+        key = (channel_id, track_id)
+        self._pending[key] = self._pending.get(key, 0) + 1
+        self.accepted += 1
+
+    def start(self, publish: Publish):
+        self._task = asyncio.create_task(self._run(publish))
+
+    async def stop(self, publish: Publish):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.flush(publish)
+
+    async def _run(self, publish: Publish):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush(publish)
+            except Exception as e:
+                logger.error(f"Like summary flush failed: {e!r}")
+
+    async def flush(self, publish: Publish):
+        pending, self._pending = self._pending, {}
+        for (channel_id, track_id), delta in pending.items():
+            # Totals live in Redis so every worker reports the same cluster-wide number
+            total = await run_redis(self.client, self.client.hincrby,
+                                    TOTALS_KEY_PREFIX + channel_id, track_id, delta)
+            await publish(channel_id, {
+                "type": "track_like_summary",
+                "channel_id": channel_id,
+                "track_id": track_id,
+                "delta": delta,
+                "total": total
+            })
+            self.summaries += 1
+
+    def stats(self) -> Dict:
+        return {
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "summaries": self.summaries,
+            "pending": len(self._pending),
+        }
+
+
+# Global instance
+like_aggregator = LikeAggregator(redis_client)
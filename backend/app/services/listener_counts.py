@@ -0,0 +1,180 @@
+# backend/app/services/listener_counts.py
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from ..redis_config import redis_client, run_redis
+from .registry import ConnectionRegistry, connection_registry
+
+logger = logging.getLogger(__name__)
+
+# At most one listener_count update per channel per interval (seconds)
+LISTENER_COUNT_INTERVAL = float(os.getenv("LISTENER_COUNT_INTERVAL", "1.0"))
+# How often each worker reports its counts, and how long a report stays valid
+COUNT_REPORT_INTERVAL = float(os.getenv("LISTENER_COUNT_REPORT_INTERVAL", "2.0"))
+COUNT_TTL = int(os.getenv("LISTENER_COUNT_TTL", "10"))
+WORKER_ID = os.getenv("WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}"
+
+WORKER_KEY_PREFIX = "listeners:worker:"
+# Sorted set of live worker ids scored by their last report time
+WORKERS_KEY = "listeners:workers"
+
+
+class ClusterListenerCounter:
+    """Listener counts summed across worker processes
+
+    Every worker writes its per-channel counts to a Redis hash that expires
+    after COUNT_TTL and heartbeats its id into one sorted set, so peers are
+    found without scanning the keyspace and a crashed worker ages out on its
+    own. Reads combine the last aggregate of the other workers with the live
+    local count.
+    """
+
+    def __init__(self, client, registry: ConnectionRegistry, worker_id: str = WORKER_ID,
+                 interval: float = COUNT_REPORT_INTERVAL, ttl: int = COUNT_TTL):
+        self.client = client
+        self.registry = registry
+        self.worker_id = worker_id
+        self.key = WORKER_KEY_PREFIX + worker_id
+        self.interval = interval
+        self.ttl = ttl
+        self.workers = 1
+        self._remote_version = 0
+        self._remote: Dict[str, int] = {}
+        self._reported: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> int:
+        """Changes whenever any count returned by count() may have changed"""
+        return self.registry.version + self._remote_version
+
+    def count(self, channel_id: str) -> int:
+        return self._remote.get(channel_id, 0) + self.registry.count(channel_id)
+
+    def counts(self) -> Dict[str, int]:
+        totals = dict(self._remote)
+        for channel_id, count in self.registry.counts().items():
+            totals[channel_id] = totals.get(channel_id, 0) + count
+        return totals
+
+    async def start(self, on_change: Callable[[str], None]):
+        self._task = asyncio.create_task(self._run(on_change))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await run_redis(self.client, self.client.delete, self.key)
+        await run_redis(self.client, self.client.zrem, WORKERS_KEY, self.worker_id)
+
+    async def _run(self, on_change: Callable[[str], None]):
+        while True:
+            try:
+                await self.sync(on_change)
+            except Exception as e:
+                logger.error(f"Listener count sync failed: {e!r}")
+            await asyncio.sleep(self.interval)
+
+    async def sync(self, on_change: Optional[Callable[[str], None]] = None):
+        """Report local counts and refresh the aggregate of every other worker"""
+        local = self.registry.counts()
+        # Channels that emptied since the last report are written as zero once
+        report = {channel_id: 0 for channel_id in self._reported - local.keys()}
+        report.update(local)
+        remote, workers = await run_redis(self.client, self._exchange, report)
+        self._reported = set(local)
+
+        if on_change:
+            for channel_id in remote.keys() ^ self._remote.keys():
+                on_change(channel_id)
+            for channel_id in remote.keys() & self._remote.keys():
+                if remote[channel_id] != self._remote[channel_id]:
+                    on_change(channel_id)
+        if remote != self._remote:
+            self._remote_version += 1
+        self._remote = remote
+        self.workers = workers
+
+    def _exchange(self, report: Dict[str, int]):
+        if report:
+            self.client.hset(self.key, mapping=report)
+        self.client.expire(self.key, self.ttl)
+        now = time.time()
+        self.client.zadd(WORKERS_KEY, {self.worker_id: now})
+        self.client.zremrangebyscore(WORKERS_KEY, "-inf", now - self.ttl)
+
+        remote: Dict[str, int] = {}
+        workers = 1
+        for worker_id in self.client.zrange(WORKERS_KEY, 0, -1):
+            if worker_id == self.worker_id:
+                continue
+            workers += 1
+            for channel_id, count in self.client.hgetall(WORKER_KEY_PREFIX + worker_id).items():
+                if int(count):
+                    remote[channel_id] = remote.get(channel_id, 0) + int(count)
+        return remote, workers
+
+
+class ListenerCountPublisher:
+    """Coalesces connect/disconnect churn into one count update per channel per tick"""
+
+    def __init__(self, counter: ClusterListenerCounter, interval: float = LISTENER_COUNT_INTERVAL):
+        self.counter = counter
+        self.interval = interval
+        self.published = 0
+        self.coalesced = 0
+        self._dirty: Set[str] = set()
+        self._last_sent: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def mark(self, channel_id: str):
+        """Record that a channel's count changed; publishing happens on the next tick"""
+        if channel_id in self._dirty:
+            self.coalesced += 1
+        else:
+            self._dirty.add(channel_id)
+
+    def start(self, publish: Callable[[str, int], Awaitable[None]]):
+        self._task = asyncio.create_task(self._run(publish))
+
+    async def _run(self, publish: Callable[[str, int], Awaitable[None]]):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush(publish)
+            except Exception as e:
+                logger.error(f"Listener count publish failed: {e!r}")
+
+    async def flush(self, publish: Callable[[str, int], Awaitable[None]]):
+        dirty, self._dirty = self._dirty, set()
+        for channel_id in dirty:
+            count = self.counter.count(channel_id)
+            # Churn that nets out to no change is not worth a broadcast
+            if self._last_sent.get(channel_id) == count:
+                continue
+            if count:
+                self._last_sent[channel_id] = count
+            else:
+                self._last_sent.pop(channel_id, None)
+            await publish(channel_id, count)
+            self.published += 1
+
+    def stats(self) -> Dict:
+        return {
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "pending": len(self._dirty),
+            "workers": self.counter.workers,
+        }
+
+
+# Global instances
+cluster_listener_counter = ClusterListenerCounter(redis_client, connection_registry)
+listener_count_publisher = ListenerCountPublisher(cluster_listener_counter)
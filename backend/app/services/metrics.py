@@ -0,0 +1,65 @@
+# backend/app/services/metrics.py
+import asyncio
+from collections import deque
+from typing import Dict, List, Optional
+
+DEFAULT_WINDOW = 1024
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LatencyWindow:
+    """Rolling window of durations in seconds, reported in milliseconds"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, duration: float):
+        self.samples.append(duration)
+        self.count += 1
+
+    def snapshot(self) -> Dict:
+        ordered = sorted(self.samples)
+        return {
+            "p50": round(_percentile(ordered, 50) * 1000, 3),
+            "p95": round(_percentile(ordered, 95) * 1000, 3),
+            "p99": round(_percentile(ordered, 99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        }
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a sleeping task"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.lag = LatencyWindow()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag.record(max(0.0, loop.time() - expected))
+
+    def snapshot(self) -> Dict:
+        return self.lag.snapshot()
+
+
+# Global instance
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,160 @@
+# backend/app/services/playout.py
+import asyncio
+import heapq
+import logging
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .channel_catalog import CatalogSnapshot
+from .records import TrackRecord
+
+logger = logging.getLogger(__name__)
+
+# Seconds to play a track whose duration is unknown
+DEFAULT_TRACK_DURATION = float(os.getenv("PLAYOUT_DEFAULT_DURATION", "30"))
+# Unix time every channel's playlist started looping from; shared by all workers
+# so they agree on what is playing without talking to each other
+PLAYOUT_EPOCH = float(os.getenv("PLAYOUT_EPOCH", "0"))
+
+Advance = Callable[[str, TrackRecord, float], None]
+
+
+class PlayoutScheduler:
+    """Per-channel playout driven by one timer over a heap of track-end deadlines
+
+    Each channel advances exactly when its current track ends. Waking up only
+    touches the channels that are due, so thousands of channels cost one
+    sleeping task and no periodic scan. Stale heap entries from reloaded or
+    removed channels are skipped lazily via a per-channel generation.
+
+    Positions come from the wall clock: a channel plays whatever its playlist
+    would be on had it looped since the shared epoch, and start times are
+    computed from the epoch rather than measured, so every worker announces
+    the same track with the same started_at.
+    """
+
+    def __init__(self, default_duration: float = DEFAULT_TRACK_DURATION, epoch: float = PLAYOUT_EPOCH):
+        self.default_duration = default_duration
+        self.epoch = epoch
+        self.advanced = 0
+        self.rejoined = 0
+        self.max_lag = 0.0
+        self._heap: List[Tuple[float, int, str]] = []
+        self._playlists: Dict[str, Tuple[TrackRecord, ...]] = {}
+        # Index and nominal wall-clock start of each channel's next track
+        self._positions: Dict[str, int] = {}
+        self._starts: Dict[str, float] = {}
+        # How far into its track a freshly placed channel already was, which is not lag
+        self._joined: Dict[str, float] = {}
+        self._generation: Dict[str, int] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self, snapshot: CatalogSnapshot):
+        """Take the channel line-up from a catalog snapshot; changed playlists rejoin the shared schedule"""
+        now, wall_now = time.monotonic(), time.time()
+        for channel_id in list(self._playlists):
+            if not snapshot.tracks.get(channel_id):
+                del self._playlists[channel_id]
+                self._positions.pop(channel_id, None)
+                self._starts.pop(channel_id, None)
+                self._joined.pop(channel_id, None)
+                self._generation[channel_id] = self._generation.get(channel_id, 0) + 1
+        for channel_id, tracks in snapshot.tracks.items():
+            if not tracks or self._playlists.get(channel_id) == tracks:
+                continue
+            self._playlists[channel_id] = tracks
+            self._place(channel_id, now, wall_now)
+        self._wake.set()
+
+    def _duration(self, track: TrackRecord) -> float:
+        return track.duration or self.default_duration
+
+    def _place(self, channel_id: str, now: float, wall_now: float):
+        """Schedule the track the shared clock says is playing, due as of its start"""
+        durations = [self._duration(track) for track in self._playlists[channel_id]]
+        total = sum(durations)
+        cycles, offset = divmod(wall_now - self.epoch, total)
+        # Built from durations alone, never a measured time, so every worker arrives at the same start
+        started_at = self.epoch + cycles * total
+        index = 0
+        for index, duration in enumerate(durations):
+            if offset < duration:
+                break
+            offset -= duration
+            started_at += duration
+        else:
+            # Rounding left us at the very end of the loop
+            index, offset, started_at = 0, 0.0, self.epoch + (cycles + 1) * total
+
+        generation = self._generation.get(channel_id, 0) + 1
+        self._generation[channel_id] = generation
+        self._positions[channel_id] = index
+        self._starts[channel_id] = started_at
+        self._joined[channel_id] = offset
+        heapq.heappush(self._heap, (now - offset, generation, channel_id))
+
+    def start(self, advance: Advance):
+        self._task = asyncio.create_task(self._run(advance))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, advance: Advance):
+        while True:
+            self._wake.clear()
+            delay = self._heap[0][0] - time.monotonic() if self._heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.dispatch_due(advance)
+
+    def dispatch_due(self, advance: Advance):
+        """Advance every channel whose current track has ended"""
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, generation, channel_id = heapq.heappop(self._heap)
+            if self._generation.get(channel_id) != generation:
+                continue
+            tracks = self._playlists[channel_id]
+            index = self._positions[channel_id]
+            track = tracks[index]
+            duration = self._duration(track)
+            behind = now - deadline
+            self.max_lag = max(self.max_lag, behind - self._joined.pop(channel_id, 0.0))
+            if behind >= duration:
+                # This track is already over; skip to wherever the shared clock is now
+                self.rejoined += 1
+                self._place(channel_id, now, time.time())
+                continue
+
+            # Deadlines and start times follow the nominal schedule, so lateness does not drift
+            started_at = self._starts[channel_id]
+            self._positions[channel_id] = (index + 1) % len(tracks)
+            self._starts[channel_id] = started_at + duration
+            heapq.heappush(self._heap, (deadline + duration, generation, channel_id))
+
+            self.advanced += 1
+            try:
+                advance(channel_id, track, started_at)
+            except Exception as e:
+                logger.error(f"Playout advance failed for channel {channel_id}: {e!r}")
+
+    def stats(self) -> Dict:
+        return {
+            "channels": len(self._playlists),
+            "pending_deadlines": len(self._heap),
+            "advanced": self.advanced,
+            "rejoined": self.rejoined,
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+        }
+
+
+# Global instance
+playout_scheduler = PlayoutScheduler()
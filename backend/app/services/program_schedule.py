@@ -0,0 +1,84 @@
+# backend/app/services/program_schedule.py
+import logging
+import re
+from datetime import datetime, time, timedelta
+from typing import Iterable, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import crud
+from ..models import Program
+from .http_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+# Weekly slots such as "Mon-Fri 06:00-10:00" or "Sat,Sun 09:30-11:00"
+SCHEDULE_PATTERN = re.compile(r"^\s*(?P<days>[A-Za-z][A-Za-z,\- ]*?)\s+(?P<hour>\d{1,2}):(?P<minute>\d{2})")
+
+
+def parse_days(spec: str) -> Set[int]:
+    """Weekday numbers (Monday is 0) covered by day names and ranges, which may wrap"""
+    days = set()
+    for part in spec.split(","):
+        first, _, last = part.strip().lower().partition("-")
+        start = DAY_NAMES.index(first.strip()[:3])
+        end = DAY_NAMES.index(last.strip()[:3]) if last else start
+        days.update((start + offset) % 7 for offset in range((end - start) % 7 + 1))
+    return days
+
+
+def next_airtime(schedule: Optional[str], after: datetime) -> Optional[datetime]:
+    """First start of a weekly slot strictly after the given time, None if the schedule can't be read"""
+    match = SCHEDULE_PATTERN.match(schedule or "")
+    if match is None:
+        return None
+    try:
+        days = parse_days(match["days"])
+        start = time(int(match["hour"]), int(match["minute"]))
+    except ValueError:
+        return None
+    for offset in range(8):
+        day = after.date() + timedelta(days=offset)
+        if day.weekday() in days:
+            airtime = datetime.combine(day, start, after.tzinfo)
+            if airtime > after:
+                return airtime
+    return None
+
+
+class ProgramSchedule:
+    """Moves recurring programs on after they air and expires cached listings right then"""
+
+    def __init__(self):
+        # Earliest upcoming airtime in any cached listing
+        self.refresh_at: Optional[datetime] = None
+
+    async def advance(self, db: AsyncSession, now: datetime):
+        """Set programs that already aired to the next start of their slot"""
+        advanced = 0
+        for program in (await db.execute(crud.aired_programs_query(now))).scalars():
+            airtime = next_airtime(program.schedule, now)
+            if airtime is not None:
+                program.next_airtime = airtime
+                advanced += 1
+        if advanced:
+            await db.commit()
+            logger.info(f"Advanced {advanced} programs to their next airtime")
+
+    def watch(self, programs: Iterable[Program], now: datetime):
+        """Note when a listing built from these programs goes stale"""
+        upcoming = [program.next_airtime for program in programs
+                    if program.next_airtime is not None and program.next_airtime > now]
+        if upcoming and (self.refresh_at is None or min(upcoming) < self.refresh_at):
+            self.refresh_at = min(upcoming)
+
+    def expire_if_due(self, now: datetime):
+        """Drop cached listings once a program in them has gone on air"""
+        if self.refresh_at is not None and now >= self.refresh_at:
+            self.refresh_at = None
+            response_cache.invalidate("programs")
+
+
+# Global instance
+program_schedule = ProgramSchedule()
@@ -0,0 +1,116 @@
+# backend/app/services/rate_limit.py
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .connection import Connection
+
+# (tokens per second, burst) for each rate-limited inbound message type
+CONNECTION_LIMITS: Dict[str, Tuple[float, float]] = {
+    "user_message": (float(os.getenv("WS_MESSAGE_RATE", "0.5")), float(os.getenv("WS_MESSAGE_BURST", "5"))),
+    "track_like": (float(os.getenv("WS_LIKE_RATE", "1")), float(os.getenv("WS_LIKE_BURST", "10"))),
+}
+# A client may hold several connections, so the per-sender budget is a bit wider
+SENDER_LIMITS: Dict[str, Tuple[float, float]] = {
+    message_type: (rate * 2, burst * 2) for message_type, (rate, burst) in CONNECTION_LIMITS.items()
+}
+# Per-sender buckets kept before the least recently active are forgotten
+MAX_TRACKED_SENDERS = int(os.getenv("RATE_LIMIT_MAX_SENDERS", "100000"))
+
+ANONYMOUS_USERS = (None, "", "anonymous")
+
+
+class TokenBucket:
+    """Classic token bucket refilled lazily on each check"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def consume(self, now: float, cost: float = 1.0) -> float:
+        """Take tokens; returns 0 if allowed, else seconds until enough are available"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Per-connection and per-sender token buckets for messages that fan out to a channel
+
+    Senders are identified by their client address, which the server observes;
+    behind a reverse proxy, run uvicorn with --proxy-headers so that is the real
+    peer. user_id is whatever the client sends and nothing authenticates it, so
+    its bucket is only advisory: it slows a client that keeps one id, while a
+    client switching ids or leaving them out still hits its address's bucket.
+    """
+
+    def __init__(self, connection_limits: Dict[str, Tuple[float, float]] = CONNECTION_LIMITS,
+                 sender_limits: Dict[str, Tuple[float, float]] = SENDER_LIMITS,
+                 max_senders: int = MAX_TRACKED_SENDERS):
+        self.connection_limits = connection_limits
+        self.sender_limits = sender_limits
+        self.max_senders = max_senders
+        self._senders: "OrderedDict[Tuple[str, str, str], TokenBucket]" = OrderedDict()
+        self.allowed: Dict[str, int] = {}
+        self.rejected: Dict[str, int] = {}
+        # Deliveries that would have gone out had rejected messages been broadcast
+        self.suppressed_deliveries = 0
+
+    def limits(self, message_type: str) -> bool:
+        return message_type in self.connection_limits
+
+    def _sender_bucket(self, kind: str, sender: str, message_type: str, now: float) -> TokenBucket:
+        key = (kind, sender, message_type)
+        bucket = self._senders.get(key)
+        if bucket is None:
+            bucket = self._senders[key] = TokenBucket(*self.sender_limits[message_type], now)
+            if len(self._senders) > self.max_senders:
+                self._senders.popitem(last=False)
+        else:
+            self._senders.move_to_end(key)
+        return bucket
+
+    def check(self, connection: Optional[Connection], client_host: Optional[str], user_id: Optional[str],
+              message_type: str, fanout: int = 0) -> float:
+        """Charge one message; returns 0 if allowed, else the retry-after in seconds"""
+        now = time.monotonic()
+        retry_after = 0.0
+
+        if connection is not None:
+            bucket = connection.rate_buckets.get(message_type)
+            if bucket is None:
+                bucket = connection.rate_buckets[message_type] = TokenBucket(*self.connection_limits[message_type], now)
+            retry_after = bucket.consume(now)
+
+        if not retry_after and client_host:
+            retry_after = self._sender_bucket("client", client_host, message_type, now).consume(now)
+
+        if not retry_after and user_id not in ANONYMOUS_USERS:
+            retry_after = self._sender_bucket("user", str(user_id), message_type, now).consume(now)
+
+        if retry_after:
+            self.rejected[message_type] = self.rejected.get(message_type, 0) + 1
+            self.suppressed_deliveries += fanout
+        else:
+            self.allowed[message_type] = self.allowed.get(message_type, 0) + 1
+        return retry_after
+
+    def stats(self) -> Dict:
+        return {
+            "allowed": dict(self.allowed),
+            "rejected": dict(self.rejected),
+            "suppressed_deliveries": self.suppressed_deliveries,
+            "tracked_senders": len(self._senders),
+        }
+
+
+# Global instance
+rate_limiter = RateLimiter()
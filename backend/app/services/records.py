@@ -0,0 +1,62 @@
+# backend/app/services/records.py
+from typing import Dict
+
+from ..models import Channel, Track
+
+CHANNEL_FIELDS = (
+    "id", "name", "description", "genre", "image_url", "color",
+    "current_listeners", "is_live", "stream_url", "created_at",
+)
+
+TRACK_FIELDS = ("id", "channel_id", "title", "artist", "album", "duration", "cover_art", "play_count")
+
+
+class Record:
+    """Immutable slotted row, safe to share between requests and threads"""
+
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            object.__setattr__(self, field, values.get(field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, field) for field in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+    def to_dict(self, **overrides) -> Dict:
+        """Fresh dict for serialization, with per-request fields such as listener counts joined in"""
+        values = {field: getattr(self, field) for field in self.__slots__}
+        values.update(overrides)
+        return values
+
+
+class ChannelRecord(Record):
+    __slots__ = CHANNEL_FIELDS
+
+    @classmethod
+    def from_model(cls, channel: Channel) -> "ChannelRecord":
+        return cls(**{field: getattr(channel, field) for field in CHANNEL_FIELDS})
+
+
+class TrackRecord(Record):
+    __slots__ = TRACK_FIELDS
+
+    @classmethod
+    def from_model(cls, track: Track) -> "TrackRecord":
+        values = {field: getattr(track, field) for field in TRACK_FIELDS}
+        values["play_count"] = values["play_count"] or 0
+        return cls(**values)
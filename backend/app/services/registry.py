@@ -0,0 +1,94 @@
+# backend/app/services/registry.py
+import os
+from typing import Dict, Iterator, List, Tuple
+
+from .connection import Connection
+
+# Topic carrying cross-channel summaries (listener counts of every channel)
+GLOBAL_TOPIC = "global"
+# Topics a single connection may follow at once
+MAX_SUBSCRIPTIONS = int(os.getenv("WS_MAX_SUBSCRIPTIONS", "32"))
+
+
+class ConnectionRegistry:
+    """Live connections indexed by topic with O(1) subscribe, unsubscribe and count"""
+
+    def __init__(self):
+        # Dicts as insertion-ordered sets: O(1) membership and removal
+        self._connections: Dict[Connection, None] = {}
+        self._topics: Dict[str, Dict[Connection, None]] = {}
+        self._counts: Dict[str, int] = {}
+        self._snapshots: Dict[str, Tuple[Connection, ...]] = {}
+        # Bumped on every membership change, so readers can tell counts moved
+        self.version = 0
+
+    @property
+    def total(self) -> int:
+        return len(self._connections)
+
+    def add(self, connection: Connection):
+        self._connections[connection] = None
+
+    def subscribe(self, connection: Connection, topic: str) -> bool:
+        """Follow a topic; returns False if already subscribed or at the subscription limit"""
+        if connection not in self._connections or topic in connection.topics:
+            return False
+        if len(connection.topics) >= MAX_SUBSCRIPTIONS:
+            return False
+        connection.topics[topic] = None
+        self._topics.setdefault(topic, {})[connection] = None
+        self._counts[topic] = self._counts.get(topic, 0) + 1
+        self._snapshots.pop(topic, None)
+        self.version += 1
+        return True
+
+    def unsubscribe(self, connection: Connection, topic: str) -> bool:
+        if connection.topics.pop(topic, 0) is not None:
+            return False
+        members = self._topics[topic]
+        del members[connection]
+        self._snapshots.pop(topic, None)
+        self.version += 1
+        if members:
+            self._counts[topic] -= 1
+        else:
+            del self._topics[topic]
+            del self._counts[topic]
+        return True
+
+    def discard(self, connection: Connection) -> List[str]:
+        """Remove a connection from every topic; returns the topics it left"""
+        if self._connections.pop(connection, 0) is not None:
+            return []
+        topics = list(connection.topics)
+        for topic in topics:
+            self.unsubscribe(connection, topic)
+        return topics
+
+    def __contains__(self, connection: Connection) -> bool:
+        return connection in self._connections
+
+    def count(self, topic: str) -> int:
+        return self._counts.get(topic, 0)
+
+    def counts(self) -> Dict[str, int]:
+        """Subscriber counts of every channel topic"""
+        counts = dict(self._counts)
+        counts.pop(GLOBAL_TOPIC, None)
+        return counts
+
+    def snapshot(self, topic: str) -> Tuple[Connection, ...]:
+        """Immutable view of a topic's subscribers, rebuilt only after membership changes"""
+        snapshot = self._snapshots.get(topic)
+        if snapshot is None:
+            snapshot = tuple(self._topics.get(topic, ()))
+            if snapshot:
+                self._snapshots[topic] = snapshot
+        return snapshot
+
+    def topics(self) -> Iterator[str]:
+        return iter(self._topics)
+
+
+# Global instance
+connection_registry = ConnectionRegistry()
@@ -0,0 +1,52 @@
+# backend/app/services/sse.py
+import os
+import time
+from typing import AsyncIterator
+
+from .connection import Connection, delivery_latency
+
+# Read-only listeners only need state updates, not chat traffic
+SSE_EVENT_TYPES = {"now_playing", "listener_count", "track_like_summary", "resync"}
+# Comment line sent on idle streams so proxies keep the response open
+SSE_KEEPALIVE = float(os.getenv("SSE_KEEPALIVE", "15"))
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "3000"))
+
+KEEPALIVE_CHUNK = b": keepalive\n\n"
+
+
+class SSEConnection(Connection):
+    """A Server-Sent Events subscriber sharing the WebSocket queueing and policies
+
+    There is no socket or writer task: the HTTP response body drains the queue.
+    """
+
+    def __init__(self):
+        super().__init__(None)
+
+    def start(self):
+        pass
+
+    def accepts(self, frame_type: str) -> bool:
+        return frame_type in SSE_EVENT_TYPES
+
+    def send(self, frame) -> bool:
+        if not self.accepts(frame.type):
+            return True
+        return super().send(frame)
+
+    async def _close_socket(self, code: int):
+        # Ending the stream closes the response
+        pass
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+        while True:
+            item = await self.next_frame(SSE_KEEPALIVE)
+            if item is None:
+                if self.closed:
+                    return
+                yield KEEPALIVE_CHUNK
+                continue
+            enqueued_at, frame = item
+            yield frame.sse
+            delivery_latency.record(time.perf_counter() - enqueued_at)
@@ -0,0 +1,125 @@
+"""Benchmark: concurrent reads and writes against SQLite, default vs tuned engine.
+
+Seeds a scratch database from the app's models, then runs reader coroutines
+(track and upcoming-program queries) alongside writer coroutines (one
+UserInteraction insert and commit each) for a fixed time. This is done once
+with the old engine setup (rollback journal, default pool) and once with
+create_async_db_engine (WAL, synchronous=NORMAL, cache/mmap, busy timeout).
+It reports throughput, latency percentiles and "database is locked" errors.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_db_concurrency [--readers 32] [--writers 8] [--duration 10]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.database import async_database_url, create_async_db_engine  # noqa: E402
+from app.models import Program, Track, UserInteraction  # noqa: E402
+from app.services.metrics import LatencyWindow  # noqa: E402
+from benchmarks.seed_data import seed  # noqa: E402
+
+
+class Counters:
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.locked = 0
+        self.read_latency = LatencyWindow(window=1_000_000)
+        self.write_latency = LatencyWindow(window=1_000_000)
+
+
+async def run_profile(profile: str, url: str, args) -> dict:
+    if profile == "default":
+        # What database.py used to build: no pragmas, driver-default pool
+        engine = create_async_engine(async_database_url(url))
+    else:
+        engine = create_async_db_engine(url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    counters = Counters()
+    deadline = time.monotonic() + args.duration
+
+    async def reader():
+        while time.monotonic() < deadline:
+            channel_id = str(random.randrange(args.channels))
+            started = time.perf_counter()
+            try:
+                async with session_factory() as db:
+                    (await db.execute(select(Track).where(Track.channel_id == channel_id))).scalars().all()
+                    (await db.execute(
+                        select(Program).where(Program.channel_id == channel_id, Program.next_airtime > datetime.now())
+                        .order_by(Program.next_airtime)
+                    )).scalars().all()
+            except OperationalError:
+                counters.locked += 1
+                continue
+            counters.read_latency.record(time.perf_counter() - started)
+            counters.reads += 1
+
+    async def writer():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                async with session_factory() as db:
+                    db.add(UserInteraction(
+                        id=str(uuid.uuid4()), user_id="bench", channel_id=str(random.randrange(args.channels)),
+                        interaction_type="dedication", content="benchmark", timestamp=datetime.now()
+                    ))
+                    await db.commit()
+            except OperationalError:
+                counters.locked += 1
+                continue
+            counters.write_latency.record(time.perf_counter() - started)
+            counters.writes += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(reader() for _ in range(args.readers)), *(writer() for _ in range(args.writers)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    return {
+        "benchmark": "db_concurrency",
+        "profile": profile,
+        "readers": args.readers,
+        "writers": args.writers,
+        "reads_per_s": round(counters.reads / elapsed, 1),
+        "writes_per_s": round(counters.writes / elapsed, 1),
+        "read_ms": counters.read_latency.snapshot(),
+        "write_ms": counters.write_latency.snapshot(),
+        "locked_errors": counters.locked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per profile")
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--programs", type=int, default=20000)
+    args = parser.parse_args()
+
+    for profile in ("default", "tuned"):
+        # Fresh file per profile: journal_mode=WAL persists in the database
+        with tempfile.TemporaryDirectory() as directory:
+            url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+            seed(url, args.channels, args.programs)
+            print(json.dumps(asyncio.run(run_profile(profile, url, args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark: event-loop lag under concurrent DB-backed requests, sync vs async sessions.
+
+Seeds a scratch SQLite database, then runs the same program and track queries
+from many concurrent coroutines, once through the blocking SessionLocal path
+and once through the async (aiosqlite) session. A ticker measures how late the
+loop wakes it, which is the delay every WebSocket on the worker would see.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_db_loop_lag [--requests 2000] [--concurrency 50] [--programs 50000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import async_database_url  # noqa: E402
+from app.models import Program, Track  # noqa: E402
+from app.services.metrics import LatencyWindow, LoopLagMonitor  # noqa: E402
+from benchmarks.seed_data import seed  # noqa: E402
+
+
+def queries(channel_id: str):
+    now = datetime.now()
+    return (
+        select(Program).where(Program.channel_id == channel_id, Program.next_airtime > now)
+        .order_by(Program.next_airtime),
+        select(Track).where(Track.channel_id == channel_id).order_by(Track.id),
+    )
+
+
+async def run_mode(mode: str, url: str, args) -> dict:
+    monitor = LoopLagMonitor(interval=args.tick)
+    monitor.lag = LatencyWindow(window=1_000_000)
+    latency = LatencyWindow(window=args.requests)
+    remaining = iter(range(args.requests))
+
+    if mode == "sync":
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        session_factory = sessionmaker(bind=engine)
+
+        async def request(channel_id: str):
+            # What an async endpoint does if it uses SessionLocal directly
+            with session_factory() as db:
+                for query in queries(channel_id):
+                    db.execute(query).scalars().all()
+    else:
+        engine = create_async_engine(async_database_url(url))
+        session_factory = async_sessionmaker(engine)
+
+        async def request(channel_id: str):
+            async with session_factory() as db:
+                for query in queries(channel_id):
+                    (await db.execute(query)).scalars().all()
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            await request(str(random.randrange(args.channels)))
+            latency.record(time.perf_counter() - started)
+            # Yield like a real server does between requests
+            await asyncio.sleep(0)
+
+    monitor.start()
+    await asyncio.sleep(args.tick * 2)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    monitor.stop()
+
+    if mode == "sync":
+        engine.dispose()
+    else:
+        await engine.dispose()
+
+    return {
+        "benchmark": "db_loop_lag",
+        "mode": mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "requests_per_s": round(args.requests / elapsed, 1),
+        "request_ms": latency.snapshot(),
+        "loop_lag_ms": monitor.snapshot(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--channels", type=int, default=500)
+    parser.add_argument("--programs", type=int, default=50000)
+    parser.add_argument("--tick", type=float, default=0.005, help="loop lag sampling interval in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        seed(url, args.channels, args.programs)
+        for mode in ("sync", "async"):
+            print(json.dumps(asyncio.run(run_mode(mode, url, args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Micro-benchmark: per-socket json.dumps vs encode-once broadcast frames.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_encode [--sockets 1000 10000 50000] [--rounds 5]
+
+Prints one JSON object per socket count with the CPU time spent per broadcast.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.frames import encode_frame  # noqa: E402
+
+MESSAGE = {
+    "type": "now_playing",
+    "track": {
+        "id": "101",
+        "title": "Sunset Dreams",
+        "artist": "Lofi Producer",
+        "album": "Chill Vibes",
+        "duration": 183,
+        "cover_art": "https://images.unsplash.com/photo-1511379938547-c1f69419868d?w=300&h=300&fit=crop"
+    },
+    "channel_id": "1",
+    "progress": 0
+}
+
+
+class NullSocket:
+    """Accepts frames without doing any I/O"""
+
+    async def send_text(self, text: str):
+        pass
+
+
+async def per_socket_dumps(sockets, message):
+    for websocket in sockets:
+        await websocket.send_text(json.dumps(message))
+
+
+async def encode_once(sockets, message):
+    frame = encode_frame(message)
+    for websocket in sockets:
+        await websocket.send_text(frame.text)
+
+
+def measure(strategy, sockets, rounds: int) -> float:
+    """Average CPU seconds per broadcast"""
+    loop = asyncio.new_event_loop()
+    try:
+        start = time.process_time()
+        for _ in range(rounds):
+            loop.run_until_complete(strategy(sockets, MESSAGE))
+        return (time.process_time() - start) / rounds
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sockets", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    for count in args.sockets:
+        sockets = [NullSocket() for _ in range(count)]
+        baseline = measure(per_socket_dumps, sockets, args.rounds)
+        encoded = measure(encode_once, sockets, args.rounds)
+        print(json.dumps({
+            "benchmark": "broadcast_encode",
+            "sockets": count,
+            "per_socket_dumps_ms": round(baseline * 1000, 3),
+            "encode_once_ms": round(encoded * 1000, 3),
+            "saved_ms": round((baseline - encoded) * 1000, 3),
+            "speedup": round(baseline / encoded, 2) if encoded else None
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Scratch database seeding shared by the database benchmarks."""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, Channel, Program, Track
+
+
+def seed(url: str, channels: int, programs: int):
+    """Create the schema and fill it with channels, ten tracks each and randomly timed programs"""
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    now = datetime.now()
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(Channel(id=str(c), name=f"Channel {c}", genre="Bench") for c in range(channels))
+        db.add_all(
+            Track(id=f"t{c}-{t}", channel_id=str(c), title=f"Track {t}", artist="Bench", duration=180)
+            for c in range(channels) for t in range(10)
+        )
+        db.add_all(
+            Program(id=f"p{p}", channel_id=str(p % channels), title=f"Program {p}",
+                    next_airtime=now + timedelta(minutes=random.randint(-10000, 10000)))
+            for p in range(programs)
+        )
+        db.commit()
+    engine.dispose()
@@ -0,0 +1,276 @@
+"""WebSocket load generator and fan-out benchmark.
+
+Starts the API in a uvicorn subprocess, opens thousands of WebSocket clients
+across several channels, drives chat and like traffic (now_playing comes from
+the server's own playout), keeps a share of clients deliberately slow, and
+reports delivery latency percentiles, throughput, server memory per
+connection and event-loop lag as JSON.
+
+Run from the backend directory:
+
+    python -m benchmarks.ws_load --clients 2000 --duration 20 --output ws_load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; the open-file limit is left as it is
+    resource = None
+
+import websockets
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_PREFIX = "bench:"
+
+
+def percentiles(samples: List[float]) -> Dict:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    def pick(pct):
+        return round(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] * 1000, 3)
+
+    return {"p50": pick(50), "p95": pick(95), "p99": pick(99), "max": round(ordered[-1] * 1000, 3)}
+
+
+def server_rss_kb(pid: int) -> Optional[int]:
+    """Resident memory from /proc, or None where there is no /proc (e.g. Windows)"""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def fetch_json(url: str) -> Dict:
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def port_in_use(port: int) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def start_server(port: int, database_dir: str) -> subprocess.Popen:
+    # Otherwise the readiness probe would happily benchmark a stale server
+    if port_in_use(port):
+        raise RuntimeError(f"Port {port} is already in use; stop that server or pass --port")
+    env = dict(os.environ)
+    # A scratch database, so runs never migrate or write the committed radio_app.db
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(database_dir, 'ws_load.db')}"
+    # Let the load through: rate limits are measured separately
+    env.setdefault("WS_MESSAGE_RATE", "10000")
+    env.setdefault("WS_MESSAGE_BURST", "10000")
+    env.setdefault("WS_LIKE_RATE", "10000")
+    env.setdefault("WS_LIKE_BURST", "10000")
+    migrate = subprocess.run([sys.executable, "-m", "app.migrations"], cwd=BACKEND_DIR, env=env,
+                             capture_output=True, text=True)
+    if migrate.returncode:
+        raise RuntimeError(f"Migrating the benchmark database failed:\n{migrate.stderr}")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL
+    )
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API server exited with code {server.returncode}")
+        try:
+            fetch_json(f"http://127.0.0.1:{port}/")
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("API server did not start")
+
+
+class Results:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.received = 0
+        self.received_by_type: Dict[str, int] = {}
+        self.sent = 0
+        self.likes_sent = 0
+        self.dropped_clients = 0
+        self.connect_failures = 0
+
+
+async def run_client(url: str, channel_id: str, slow_delay: float, like_rate: float,
+                     results: Results, ready: asyncio.Event, stop: asyncio.Event,
+                     connected: List[int]):
+    try:
+        websocket = await websockets.connect(f"{url}/ws/{channel_id}", open_timeout=30, close_timeout=1)
+    except Exception:
+        results.connect_failures += 1
+        return
+    connected[0] += 1
+    await ready.wait()
+
+    async def like_loop():
+        if like_rate <= 0:
+            return
+        while not stop.is_set():
+            await asyncio.sleep(random.expovariate(like_rate))
+            await websocket.send(json.dumps({
+                "type": "track_like",
+                "track_id": str(random.randint(1, 20)),
+                "user_id": f"bench-{id(websocket)}"
+            }))
+            results.likes_sent += 1
+
+    liker = asyncio.create_task(like_loop())
+    try:
+        while not stop.is_set():
+            try:
+                data = await asyncio.wait_for(websocket.recv(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            now = time.time()
+            message = json.loads(data)
+            message_type = message.get("type")
+            results.received += 1
+            results.received_by_type[message_type] = results.received_by_type.get(message_type, 0) + 1
+            if message_type == "ping":
+                await websocket.send(json.dumps({"type": "pong"}))
+            content = message.get("content")
+            if message_type == "user_message" and isinstance(content, str) and content.startswith(BENCH_PREFIX):
+                results.latencies.append(now - float(content[len(BENCH_PREFIX):]))
+            if slow_delay:
+                await asyncio.sleep(slow_delay)
+    except websockets.ConnectionClosed:
+        results.dropped_clients += 1
+    finally:
+        liker.cancel()
+        await websocket.close()
+
+
+async def run_sender(url: str, channel_id: str, rate: float, results: Results,
+                     ready: asyncio.Event, stop: asyncio.Event):
+    async with websockets.connect(f"{url}/ws/{channel_id}") as websocket:
+        await ready.wait()
+        interval = 1 / rate
+        next_send = time.monotonic()
+        while not stop.is_set():
+            await websocket.send(json.dumps({
+                "type": "user_message",
+                "user_id": f"sender-{channel_id}",
+                "content": f"{BENCH_PREFIX}{time.time()}"
+            }))
+            results.sent += 1
+            next_send += interval
+            await asyncio.sleep(max(0.0, next_send - time.monotonic()))
+
+
+async def run(args) -> Dict:
+    if resource is not None:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, max(soft, args.clients * 2 + 256)), hard))
+
+    with tempfile.TemporaryDirectory(prefix="ws_load-") as database_dir:
+        server = start_server(args.port, database_dir)
+        http_url = f"http://127.0.0.1:{args.port}"
+        ws_url = f"ws://127.0.0.1:{args.port}"
+        try:
+            baseline_rss = server_rss_kb(server.pid)
+            results = Results()
+            ready, stop = asyncio.Event(), asyncio.Event()
+            connected = [0]
+            channels = [str(channel) for channel in range(1, args.channels + 1)]
+
+            connect_started = time.perf_counter()
+            clients = []
+            for index in range(args.clients):
+                slow = random.random() < args.slow_fraction
+                clients.append(asyncio.create_task(run_client(
+                    ws_url, channels[index % len(channels)], args.slow_delay if slow else 0.0,
+                    0.0 if slow else args.like_rate, results, ready, stop, connected
+                )))
+                if index % 200 == 199:
+                    await asyncio.sleep(0.05)
+            while connected[0] + results.connect_failures < args.clients:
+                await asyncio.sleep(0.1)
+            connect_seconds = time.perf_counter() - connect_started
+            connected_rss = server_rss_kb(server.pid)
+
+            senders = [asyncio.create_task(run_sender(ws_url, channel_id, args.message_rate, results, ready, stop))
+                       for channel_id in channels]
+            await asyncio.sleep(0.5)
+            ready.set()
+            started = time.perf_counter()
+            await asyncio.sleep(args.duration)
+            stop.set()
+            elapsed = time.perf_counter() - started
+            await asyncio.gather(*clients, *senders, return_exceptions=True)
+
+            per_connection_kb = None
+            if baseline_rss is not None and connected_rss is not None and connected[0]:
+                per_connection_kb = round((connected_rss - baseline_rss) / connected[0], 2)
+
+            return {
+                "benchmark": "ws_load",
+                "config": vars(args),
+                "connections": {
+                    "opened": connected[0],
+                    "failed": results.connect_failures,
+                    "connect_seconds": round(connect_seconds, 3),
+                    "dropped_during_run": results.dropped_clients,
+                },
+                "traffic": {
+                    "chat_sent": results.sent,
+                    "likes_sent": results.likes_sent,
+                    "frames_received": results.received,
+                    "frames_received_by_type": results.received_by_type,
+                    "throughput_frames_per_s": round(results.received / elapsed, 1),
+                },
+                "delivery_latency_ms": percentiles(results.latencies),
+                "server_memory_per_connection_kb": per_connection_kb,
+                "server_metrics": fetch_json(f"{http_url}/api/metrics"),
+            }
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket fan-out load benchmark")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--channels", type=int, default=3)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of traffic")
+    parser.add_argument("--message-rate", type=float, default=10.0, help="chat messages per second per channel")
+    parser.add_argument("--like-rate", type=float, default=0.2, help="likes per second per client")
+    parser.add_argument("--slow-fraction", type=float, default=0.05, help="share of clients that read slowly")
+    parser.add_argument("--slow-delay", type=float, default=1.0, help="seconds a slow client waits per frame")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 import uvicorn
 
+from app.migrations import upgrade_database
+
 if __name__ == "__main__":
+    # Migrate once here rather than in each worker process
+    upgrade_database()
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
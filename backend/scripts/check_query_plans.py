@@ -0,0 +1,74 @@
+"""Check that hot queries are served by their indexes.
+
+Migrates a scratch SQLite database to head, then runs EXPLAIN QUERY PLAN on
+the query builders in app/crud.py. Exits non-zero if any of them scans its
+table or sorts in a temporary B-tree instead of using the expected index, so
+a migration or query change that loses an index fails loudly in CI.
+
+Run from the backend directory:
+
+    python -m scripts.check_query_plans
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Select  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.database import create_db_engine  # noqa: E402
+from app.migrations import upgrade_database  # noqa: E402
+
+# (description, query, index it must use)
+HOT_QUERIES: List[Tuple[str, Select, str]] = [
+    ("channel track list", crud.tracks_query("1"), "ix_tracks_channel_id_id"),
+    ("upcoming programs for a channel", crud.programs_query("1", datetime.now()), "ix_programs_channel_id_next_airtime"),
+    ("upcoming programs", crud.programs_query(None, datetime.now()), "ix_programs_next_airtime"),
+    ("programs that already aired", crud.aired_programs_query(datetime.now()), "ix_programs_next_airtime"),
+    ("channel interaction history", crud.interactions_query("1"), "ix_user_interactions_channel_id_timestamp"),
+]
+
+
+def query_plan(connection, query: Select) -> List[str]:
+    compiled = query.compile(dialect=connection.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def check(connection, query: Select, index: str) -> List[str]:
+    """Problems with a query's plan, empty if it is served by the index"""
+    plan = query_plan(connection, query)
+    problems = []
+    if not any(f"INDEX {index}" in step for step in plan):
+        problems.append(f"does not use {index}")
+    problems.extend(f"plan step: {step}" for step in plan
+                    if step.startswith("SCAN") or "TEMP B-TREE" in step)
+    return problems
+
+
+def main() -> int:
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'plans.db')}"
+        upgrade_database(url)
+        engine = create_db_engine(url)
+        try:
+            with engine.connect() as connection:
+                for description, query, index in HOT_QUERIES:
+                    problems = check(connection, query, index)
+                    print(f"{'FAIL' if problems else 'ok':4}  {description} ({index})")
+                    for problem in problems:
+                        print(f"      {problem}")
+                    failures += bool(problems)
+        finally:
+            engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
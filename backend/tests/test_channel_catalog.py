@@ -0,0 +1,46 @@
+"""Regression tests for channel listing by genre.
+
+Run from the backend directory:
+
+    python -m pytest tests
+"""
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services.channel_catalog import ChannelCatalog, channel_catalog  # noqa: E402
+from app.services.records import ChannelRecord  # noqa: E402
+
+CHANNELS = [
+    ChannelRecord(id="1", name="Lofi", genre="Lo-Fi", is_live=True, created_at=datetime(2024, 1, 1)),
+    ChannelRecord(id="2", name="Focus", genre="Electronic", is_live=False, created_at=datetime(2024, 1, 2)),
+]
+
+
+def test_empty_genre_is_no_filter():
+    catalog = ChannelCatalog()
+    catalog.publish(CHANNELS, [])
+    assert catalog.list("") == catalog.list() == tuple(CHANNELS)
+    assert catalog.list("", is_live=True) == (CHANNELS[0],)
+    assert catalog.list("ELECTRONIC") == (CHANNELS[1],)
+
+
+def test_empty_genre_request_does_not_poison_channel_list():
+    channel_catalog.publish(CHANNELS, [])
+    client = TestClient(app)
+    assert [c["id"] for c in client.get("/api/channels?genre=").json()] == ["1", "2"]
+    assert [c["id"] for c in client.get("/api/channels").json()] == ["1", "2"]
+    assert [c["id"] for c in client.get("/api/channels?genre=lo-fi").json()] == ["1"]
+
+
+def test_unknown_genre_and_channel_are_not_found():
+    channel_catalog.publish(CHANNELS, [])
+    client = TestClient(app)
+    assert client.get("/api/channels?genre=polka").status_code == 404
+    assert client.get("/api/channels/nope/tracks").status_code == 404
+    assert client.get("/api/channels/1/tracks").status_code == 200
@@ -0,0 +1,30 @@
+"""Tests for the response cache's memory bound.
+
+Run from the backend directory:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.http_cache import RESPONSE_CACHE_ENTRY_OVERHEAD, ResourceVersions, ResponseCache  # noqa: E402
+
+
+def test_tiny_bodies_still_count_against_the_budget():
+    cache = ResponseCache(ResourceVersions(), max_bytes=100 * RESPONSE_CACHE_ENTRY_OVERHEAD)
+    for index in range(10_000):
+        cache.put(("tracks", str(index)), ("tracks",), b"[]")
+    assert len(cache._entries) < 100
+    assert cache.bytes <= cache.max_bytes
+
+
+def test_invalidate_drops_tagged_entries_and_bumps_version():
+    cache = ResponseCache(ResourceVersions())
+    cache.put("a", ("tracks",), b"[1]")
+    version = cache.versions.get("tracks")
+    cache.invalidate("tracks")
+    assert cache.get("a") is None
+    assert cache.bytes == 0
+    assert cache.versions.get("tracks") == version + 1
@@ -0,0 +1,43 @@
+"""Tests for cluster-wide like de-duplication.
+
+Run from the backend directory:
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.redis_config import SimpleRedis  # noqa: E402
+from app.services.likes import LikeAggregator, seen_key  # noqa: E402
+
+
+def test_repeat_like_on_another_worker_is_dropped():
+    async def scenario():
+        shared = SimpleRedis()
+        first, second = LikeAggregator(shared), LikeAggregator(shared)
+        assert await first.claim("1", "101", "alice")
+        assert not await second.claim("1", "101", "alice")
+        assert await second.claim("1", "101", "bob")
+        assert await second.claim("1", "101", "anonymous")
+        assert await first.claim("1", "101", "anonymous")
+        assert second.duplicates == 1
+
+    asyncio.run(scenario())
+
+
+def test_released_like_can_be_claimed_again():
+    async def scenario():
+        aggregator = LikeAggregator(SimpleRedis())
+        assert await aggregator.claim("1", "101", "alice")
+        await aggregator.release("1", "101", "alice")
+        assert await aggregator.claim("1", "101", "alice")
+
+    asyncio.run(scenario())
+
+
+def test_seen_key_is_stable():
+    assert seen_key("1", "101", "alice") == seen_key("1", "101", "alice")
+    assert seen_key("1", "101", "alice") != seen_key("1", "10", "1alice")
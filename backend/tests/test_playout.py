@@ -0,0 +1,41 @@
+"""Tests for the epoch-based playout schedule.
+
+Run from the backend directory:
+
+    python -m pytest tests
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.channel_catalog import CatalogSnapshot  # noqa: E402
+from app.services.playout import PlayoutScheduler  # noqa: E402
+from app.services.records import TrackRecord  # noqa: E402
+
+TRACKS = [TrackRecord(id=str(i), channel_id="1", duration=duration) for i, duration in enumerate((180, 240, 200))]
+
+
+def now_playing(scheduler: PlayoutScheduler):
+    played = []
+    scheduler.load(CatalogSnapshot([], TRACKS, 1))
+    scheduler.dispatch_due(lambda channel_id, track, started_at: played.append((track.id, started_at)))
+    return played
+
+
+def test_workers_started_at_different_times_agree():
+    epoch = time.time() - 10_000
+    first = now_playing(PlayoutScheduler(epoch=epoch))
+    time.sleep(0.05)
+    second = now_playing(PlayoutScheduler(epoch=epoch))
+    assert len(first) == 1
+    assert first == second
+
+
+def test_position_follows_elapsed_time_modulo_playlist():
+    # 620s loop; 1000s in is 380s into the loop: the second track, started 180s in
+    epoch = time.time() - 1000
+    ((track_id, started_at),) = now_playing(PlayoutScheduler(epoch=epoch))
+    assert track_id == "1"
+    assert started_at == epoch + 620 + 180
@@ -0,0 +1,30 @@
+"""Tests for per-sender rate limiting.
+
+Run from the backend directory:
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.rate_limit import RateLimiter  # noqa: E402
+
+LIMITS = {"user_message": (0.001, 3)}
+
+
+def allowed(limiter: RateLimiter, client_host, user_ids) -> int:
+    return sum(not limiter.check(None, client_host, user_id, "user_message") for user_id in user_ids)
+
+
+def test_switching_or_omitting_user_id_does_not_escape_the_address_bucket():
+    limiter = RateLimiter(LIMITS, LIMITS)
+    assert allowed(limiter, "10.0.0.1", [f"user-{i}" for i in range(10)]) == 3
+    assert allowed(limiter, "10.0.0.1", [None] * 5) == 0
+    assert allowed(limiter, "10.0.0.2", [None] * 5) == 3
+
+
+def test_user_id_bucket_still_applies_across_addresses():
+    limiter = RateLimiter(LIMITS, LIMITS)
+    assert sum(allowed(limiter, f"10.0.0.{i}", ["alice"]) for i in range(10)) == 3
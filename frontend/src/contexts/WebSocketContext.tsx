@@ -10,6 +10,8 @@ interface WebSocketContextType {
   listenerCounts: { [channelId: string]: number };
   messages: WebSocketMessage[];
   sendMessage: (channelId: string, message: WebSocketMessage) => void;
+  subscribe: (channelId: string) => void;
+  unsubscribe: (channelId: string) => void;
 }
 
 const WebSocketContext = createContext<WebSocketContextType | undefined>(undefined);
@@ -20,23 +22,35 @@ export const WebSocketProvider: React.FC<{ children: React.ReactNode }> = ({ chi
   const [messages, setMessages] = useState<WebSocketMessage[]>([]);
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<NodeJS.Timeout>();
+  const lastSeqRef = useRef<{ [channelId: string]: number }>({});
+  // Topics followed over the single multiplexed connection
+  const topicsRef = useRef<Set<string>>(new Set(['global']));
+
+  const sendSubscribe = (topic: string) => {
+    const lastSeq = lastSeqRef.current[topic];
+    // Resume from the last seen event so the server only replays what we missed
+    wsRef.current?.send(JSON.stringify({
+      type: 'subscribe',
+      channel_id: topic,
+      ...(lastSeq !== undefined ? { last_seq: lastSeq } : {})
+    }));
+  };
 
-  const connect = (channelId?: string) => {
+  const connect = () => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
       return;
     }
 
     try {
       const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-      const wsUrl = channelId 
-        ? `${protocol}//${window.location.host}/ws/${channelId}`
-        : `${protocol}//${window.location.host}/ws/global`;
+      const wsUrl = `${protocol}//${window.location.host}/ws`;
       
       wsRef.current = new WebSocket(wsUrl);
 
       wsRef.current.onopen = () => {
         setIsConnected(true);
         console.log('WebSocket connected');
+        topicsRef.current.forEach(sendSubscribe);
       };
 
       wsRef.current.onmessage = (event) => {
@@ -54,7 +68,7 @@ export const WebSocketProvider: React.FC<{ children: React.ReactNode }> = ({ chi
         
         // Attempt reconnect after 3 seconds
         reconnectTimeoutRef.current = setTimeout(() => {
-          connect(channelId);
+          connect();
         }, 3000);
       };
 
@@ -68,6 +82,27 @@ export const WebSocketProvider: React.FC<{ children: React.ReactNode }> = ({ chi
   };
 
   const handleWebSocketMessage = (message: WebSocketMessage) => {
+    if (typeof message.seq === 'number') {
+      lastSeqRef.current[message.channel_id || 'global'] = message.seq;
+    }
+
+    if (message.type === 'ping') {
+      // Server heartbeat: answer so the connection isn't reaped as dead
+      wsRef.current?.send(JSON.stringify({ type: 'pong' }));
+      return;
+    }
+
+    if (message.type === 'resync') {
+      // Gap too large to replay: restart from the server's current position
+      const topic = message.channel_id || 'global';
+      if (typeof message.seq === 'number') {
+        lastSeqRef.current[topic] = message.seq;
+      } else {
+        delete lastSeqRef.current[topic];
+      }
+      return;
+    }
+
     setMessages(prev => [...prev.slice(-99), message]); // Keep last 100 messages
 
     switch (message.type) {
@@ -95,12 +130,31 @@ export const WebSocketProvider: React.FC<{ children: React.ReactNode }> = ({ chi
 
   const sendMessage = (channelId: string, message: WebSocketMessage) => {
     if (wsRef.current?.readyState === WebSocket.OPEN) {
-      wsRef.current.send(JSON.stringify(message));
+      wsRef.current.send(JSON.stringify({ channel_id: channelId, ...message }));
     } else {
       console.warn('WebSocket not connected');
     }
   };
 
+  const subscribe = (channelId: string) => {
+    if (topicsRef.current.has(channelId)) {
+      return;
+    }
+    topicsRef.current.add(channelId);
+    if (wsRef.current?.readyState === WebSocket.OPEN) {
+      sendSubscribe(channelId);
+    }
+  };
+
+  const unsubscribe = (channelId: string) => {
+    if (!topicsRef.current.delete(channelId)) {
+      return;
+    }
+    if (wsRef.current?.readyState === WebSocket.OPEN) {
+      wsRef.current.send(JSON.stringify({ type: 'unsubscribe', channel_id: channelId }));
+    }
+  };
+
   useEffect(() => {
     // Connect to global WebSocket for initial data
     connect();
@@ -120,7 +174,9 @@ export const WebSocketProvider: React.FC<{ children: React.ReactNode }> = ({ chi
       isConnected,
       listenerCounts,
       messages,
-      sendMessage
+      sendMessage,
+      subscribe,
+      unsubscribe
     }}>
       {children}
     </WebSocketContext.Provider>
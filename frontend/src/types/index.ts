@@ -61,7 +61,22 @@ export interface PushSubscription {
 
 // WebSocket message types
 export interface WebSocketMessage {
-  type: 'listener_count' | 'now_playing' | 'user_message' | 'track_like' | 'ping' | 'pong';
+  type:
+    | 'listener_count'
+    | 'now_playing'
+    | 'user_message'
+    | 'track_like'
+    | 'track_like_summary'
+    | 'ping'
+    | 'pong'
+    | 'subscribe'
+    | 'unsubscribe'
+    | 'subscribed'
+    | 'unsubscribed'
+    | 'subscribe_failed'
+    | 'rate_limited'
+    | 'server_busy'
+    | 'resync';
   [key: string]: any;
 }
 
@@ -9,5 +9,6 @@ REM Start Backend
 echo Starting Backend Server...
 cd backend
 call venv\Scripts\activate
+python -m app.migrations
 python -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
 pause
\ No newline at end of file